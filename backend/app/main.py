@@ -6,7 +6,7 @@ A FastAPI-based backend for face recognition attendance tracking
 from fastapi import FastAPI, HTTPException, Depends, status, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.websockets import WebSocket, WebSocketDisconnect
 from websockets.exceptions import ConnectionClosedError
 import logging
@@ -28,6 +28,21 @@ from utils.logging import get_logger
 # Set up logging
 logger = get_logger(__name__)
 
+# Error responses are serialized with orjson when it is installed
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as ErrorResponse
+except ImportError:
+    orjson = None
+    ErrorResponse = JSONResponse
+
+# The generic 500 body never changes, so serialize it once at import time
+if orjson is not None:
+    _INTERNAL_ERROR_BODY = orjson.dumps({"detail": "Internal server error", "status_code": 500})
+else:
+    import json
+    _INTERNAL_ERROR_BODY = json.dumps({"detail": "Internal server error", "status_code": 500}).encode()
+
 # Global WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
@@ -263,7 +278,7 @@ async def root():
 # Custom exception handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ErrorResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail, "status_code": exc.status_code}
     )
@@ -271,7 +286,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return Response(
+        content=_INTERNAL_ERROR_BODY,
         status_code=500,
-        content={"detail": "Internal server error", "status_code": 500}
+        media_type="application/json"
     )
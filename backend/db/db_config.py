@@ -39,12 +39,18 @@ engine = create_engine(
 # Create sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Session factories for explicitly requested URLs, so each URL gets one pooled engine
+_session_factories = {}
+
 def get_db_session(database_url: str = None) -> Generator:
     """Get database session generator for dependency injection"""
     if database_url:
-        # Create a new engine for the provided URL
-        temp_engine = create_engine(database_url)
-        temp_session = sessionmaker(autocommit=False, autoflush=False, bind=temp_engine)
+        # Reuse the pooled engine for this URL instead of creating one per call
+        temp_session = _session_factories.get(database_url)
+        if temp_session is None:
+            temp_engine = create_engine(database_url, pool_pre_ping=True)
+            temp_session = sessionmaker(autocommit=False, autoflush=False, bind=temp_engine)
+            _session_factories[database_url] = temp_session
         db = temp_session()
     else:
         db = SessionLocal()
@@ -7,6 +7,7 @@ Detects all available cameras and integrates them with the FTS system
 import cv2
 import os
 import time
+import asyncio
 import logging
 import threading
 import requests
@@ -185,11 +186,11 @@ class AutoCameraDetector:
             logger.warning(f"IP camera discovery failed: {e}")
             
         # Also scan common IP camera addresses
-        cameras.extend(self._scan_common_ip_addresses())
+        cameras.extend(await self._scan_common_ip_addresses())
         
         return cameras
     
-    def _scan_common_ip_addresses(self) -> List[DetectedCamera]:
+    async def _scan_common_ip_addresses(self) -> List[DetectedCamera]:
         """Scan common IP camera addresses on local network"""
         cameras = []
         
@@ -214,11 +215,16 @@ class AutoCameraDetector:
             ]
             
             # Scan last 50 IPs in range (to avoid too long scan)
-            for ip_suffix in range(200, 250):
-                ip = f"{network_base}.{ip_suffix}"
-                
+            candidate_ips = [f"{network_base}.{ip_suffix}" for ip_suffix in range(200, 250)]
+            
+            # Probe every ip/port pair at once so the sweep costs one timeout, not one per pair
+            targets = [(ip, port) for ip in candidate_ips for port in common_ports]
+            results = await asyncio.gather(*(self._check_ip_camera_port(ip, port) for ip, port in targets))
+            open_ports = {target for target, is_open in zip(targets, results) if is_open}
+            
+            for ip in candidate_ips:
                 for port in common_ports:
-                    if self._check_ip_camera_port(ip, port):
+                    if (ip, port) in open_ports:
                         # Try different stream URLs
                         for path in common_paths:
                             if port == 554:
@@ -253,17 +259,20 @@ class AutoCameraDetector:
         
         return cameras
     
-    def _check_ip_camera_port(self, ip: str, port: int, timeout: float = 1.0) -> bool:
+    async def _check_ip_camera_port(self, ip: str, port: int, timeout: float = 1.0) -> bool:
         """Check if a port is open on an IP address"""
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            result = sock.connect_ex((ip, port))
-            sock.close()
-            return result == 0
-        except (socket.error, OSError, Exception) as e:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        except (asyncio.TimeoutError, OSError) as e:
             logger.debug(f"Port check failed for {ip}:{port}: {e}")
             return False
+        
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
     
     def _test_stream_url(self, url: str, timeout: float = 3.0) -> bool:
         """Test if a stream URL is accessible"""
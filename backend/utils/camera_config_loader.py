@@ -5,8 +5,11 @@ Loads camera configurations from the database for the FTS system
 
 from typing import List, Optional
 from dataclasses import dataclass
+from functools import lru_cache
 import logging
 
+from sqlalchemy.orm import selectinload
+
 from db.db_manager import DatabaseManager
 from db.db_models import CameraConfig as DBCameraConfig, Tripwire as DBTripwire
 
@@ -50,15 +53,7 @@ class CameraConfigLoader:
             List of active camera configurations
         """
         try:
-            # Get all active cameras from database
-            db_cameras = self.db_manager.get_active_cameras()
-            
-            camera_configs = []
-            for db_camera in db_cameras:
-                # Convert database camera to FTS camera config
-                camera_config = self._convert_db_camera_to_fts_config(db_camera)
-                if camera_config:
-                    camera_configs.append(camera_config)
+            camera_configs = self._load_cameras(DBCameraConfig.is_active == True)
             
             logger.info(f"Loaded {len(camera_configs)} active camera configurations")
             return camera_configs
@@ -75,15 +70,7 @@ class CameraConfigLoader:
             List of all camera configurations
         """
         try:
-            # Get all cameras from database
-            db_cameras = self.db_manager.get_all_cameras()
-            
-            camera_configs = []
-            for db_camera in db_cameras:
-                # Convert database camera to FTS camera config
-                camera_config = self._convert_db_camera_to_fts_config(db_camera)
-                if camera_config:
-                    camera_configs.append(camera_config)
+            camera_configs = self._load_cameras()
             
             logger.info(f"Loaded {len(camera_configs)} camera configurations")
             return camera_configs
@@ -103,16 +90,43 @@ class CameraConfigLoader:
             Camera configuration or None if not found
         """
         try:
-            db_camera = self.db_manager.get_camera(camera_id)
-            if not db_camera:
-                return None
-            
-            return self._convert_db_camera_to_fts_config(db_camera)
+            camera_configs = self._load_cameras(DBCameraConfig.camera_id == camera_id)
+            return camera_configs[0] if camera_configs else None
             
         except Exception as e:
             logger.error(f"Error loading camera {camera_id}: {e}")
             return None
     
+    def _load_cameras(self, *criteria) -> List[CameraConfig]:
+        """
+        Load and convert cameras matching `criteria` in a single session
+        
+        Tripwires are fetched with one extra query for all cameras, instead of
+        a new session and query per camera.
+        
+        Args:
+            criteria: SQLAlchemy filter expressions on the camera table
+            
+        Returns:
+            List of converted camera configurations
+        """
+        with self.db_manager.Session() as session:
+            db_cameras = (
+                session.query(DBCameraConfig)
+                .options(selectinload(DBCameraConfig.tripwires))
+                .filter(*criteria)
+                .all()
+            )
+            
+            camera_configs = []
+            for db_camera in db_cameras:
+                # Convert database camera to FTS camera config
+                camera_config = self._convert_db_camera_to_fts_config(db_camera)
+                if camera_config:
+                    camera_configs.append(camera_config)
+            
+            return camera_configs
+    
     def _convert_db_camera_to_fts_config(self, db_camera: DBCameraConfig) -> Optional[CameraConfig]:
         """
         Convert database camera model to FTS camera configuration
@@ -124,12 +138,9 @@ class CameraConfigLoader:
             FTS camera configuration or None if conversion fails
         """
         try:
-            # Get tripwires for this camera
-            db_tripwires = self.db_manager.get_camera_tripwires(db_camera.camera_id)
-            
-            # Convert tripwires - only include active ones
+            # Convert tripwires (eager-loaded with the camera) - only include active ones
             tripwires = []
-            for db_tripwire in db_tripwires:
+            for db_tripwire in db_camera.tripwires:
                 if getattr(db_tripwire, 'is_active', True):  # Default to True if field doesn't exist
                     tripwire = TripwireConfig(
                         position=db_tripwire.position,
@@ -220,6 +231,11 @@ class CameraConfigLoader:
             return False
 
 # Convenience functions
+@lru_cache(maxsize=1)
+def _get_loader() -> CameraConfigLoader:
+    """Shared loader so every caller goes through one DatabaseManager and its pooled engine"""
+    return CameraConfigLoader()
+
 def load_active_camera_configs() -> List[CameraConfig]:
     """
     Convenience function to load active camera configurations
@@ -227,7 +243,7 @@ def load_active_camera_configs() -> List[CameraConfig]:
     Returns:
         List of active camera configurations
     """
-    loader = CameraConfigLoader()
+    loader = _get_loader()
     return loader.load_active_cameras()
 
 def load_all_camera_configs() -> List[CameraConfig]:
@@ -237,7 +253,7 @@ def load_all_camera_configs() -> List[CameraConfig]:
     Returns:
         List of all camera configurations
     """
-    loader = CameraConfigLoader()
+    loader = _get_loader()
     return loader.load_all_cameras()
 
 def load_camera_config_by_id(camera_id: int) -> Optional[CameraConfig]:
@@ -250,5 +266,5 @@ def load_camera_config_by_id(camera_id: int) -> Optional[CameraConfig]:
     Returns:
         Camera configuration or None if not found
     """
-    loader = CameraConfigLoader()
+    loader = _get_loader()
     return loader.load_camera_by_id(camera_id)
\ No newline at end of file
@@ -12,6 +12,12 @@ def safe_get(obj: Any, key: str, default: Any = None) -> Any:
     """
     Safely get a value from an object/dict with null checking
     """
+    # Fast path: plain dicts are by far the most common input
+    if type(obj) is dict:
+        try:
+            return obj.get(key, default)
+        except TypeError:
+            return default
     if obj is None:
         return default
     
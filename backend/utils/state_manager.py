@@ -7,6 +7,7 @@ import threading
 import time
 from typing import Dict, Any, Optional, List
 from collections import deque, defaultdict
+from itertools import islice
 from datetime import datetime
 import logging
 
@@ -17,7 +18,7 @@ class StateManager:
     
     def __init__(self):
         # Thread synchronization
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()
         self._log_lock = threading.Lock()
         self._stats_lock = threading.Lock()
         
@@ -58,7 +59,7 @@ class StateManager:
         with self._lock:
             self._is_tracking_running = running
             if running and self._start_time is None:
-                self._start_time = time.time()
+                self._start_time = time.monotonic()
     
     def is_tracking_running(self) -> bool:
         """Check if tracking is running"""
@@ -66,7 +67,7 @@ class StateManager:
             return self._is_tracking_running
     
     def get_start_time(self) -> Optional[float]:
-        """Get system start time"""
+        """Get system start time (monotonic clock, only meaningful for elapsed time)"""
         with self._lock:
             return self._start_time
     
@@ -116,7 +117,11 @@ class StateManager:
         with self._lock:
             if n is None:
                 return list(self._latest_attendance)
-            return list(self._latest_attendance)[-n:]
+            # Copy only the tail instead of materializing the whole deque;
+            # the start index matches records[-n:], including n <= 0
+            records = self._latest_attendance
+            start = max(0, len(records) - n) if n > 0 else -n
+            return list(islice(records, start, None))
     
     # Department Presence Management
     def update_department_presence(self, department: str, users: List[str]):
@@ -144,7 +149,7 @@ class StateManager:
         with self._stats_lock:
             # Update uptime if system is running
             if self._start_time:
-                self._system_stats["uptime"] = time.time() - self._start_time
+                self._system_stats["uptime"] = time.monotonic() - self._start_time
             return self._system_stats.copy()
     
     def increment_stat(self, stat_name: str, increment: int = 1):
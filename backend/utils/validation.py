@@ -3,31 +3,74 @@ Comprehensive input validation utilities for the Face Recognition System
 """
 
 import re
+import string
+import threading
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 from utils.error_handling import ValidationError
 import ipaddress
+import socket
+
+# Pre-compiled patterns shared by the validators below
+# URL body after the scheme; the scheme itself is matched with str.startswith
+_URL_REST_RE = re.compile(r'[^\s/$.?#].[^\s]*$')
+_URL_SCHEME_PREFIXES = ('http://', 'https://', 'rtsp://')
+_HTML_TAG_RE = re.compile(r'<[^>]*>')
+# Accepted ISO shapes: date, date+time, optional fraction, optional trailing Z.
+# Like strptime's %m/%d/%H/%M/%S, single-digit fields are allowed (2024-1-5)
+_ISO_DATE_RE = re.compile(
+    r'^(\d{4})-(\d{1,2})-(\d{1,2})(?:T(\d{1,2}):(\d{1,2}):(\d{1,2})(?:\.(\d{1,6}))?Z?)?$'
+)
+
+# Allowed characters for the structural email check
+_EMAIL_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + '._%+-')
+_EMAIL_DOMAIN_CHARS = frozenset(string.ascii_letters + string.digits + '.-')
+
+# translate() tables that delete every allowed character; anything left over is invalid
+_EMPLOYEE_ID_STRIP = str.maketrans('', '', string.ascii_letters + string.digits + '_-')
+_USERNAME_STRIP = str.maketrans('', '', string.ascii_letters + string.digits + '._-')
+
+# Allowed enum values (tuples keep error-message order, frozensets do the lookup)
+_VALID_ROLES = ('employee', 'admin', 'super_admin')
+_VALID_ROLE_SET = frozenset(_VALID_ROLES)
+_VALID_CAMERA_TYPES = ('usb', 'ip', 'rtsp', 'onvif', 'builtin')
+_VALID_CAMERA_TYPE_SET = frozenset(_VALID_CAMERA_TYPES)
+
+def _coerce_str(value: Any, message: str) -> str:
+    """Return value stripped once, raising ValidationError for non-string or blank input"""
+    if type(value) is not str and not isinstance(value, str):
+        raise ValidationError(message)
+    
+    value = value.strip()
+    if not value:
+        raise ValidationError(message)
+    
+    return value
 
 def validate_email(email: str) -> str:
     """Validate email format"""
-    if not email or not isinstance(email, str):
-        raise ValidationError("Email is required and must be a string")
-    
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_pattern, email.strip()):
+    value = _coerce_str(email, "Email is required and must be a string")
+    
+    # Linear-time structural check (no regex backtracking on hostile input)
+    local, at, domain = value.partition('@')
+    host, dot, tld = domain.rpartition('.')
+    if not (
+        at and local and host and dot
+        and len(tld) >= 2 and tld.isascii() and tld.isalpha()
+        and _EMAIL_LOCAL_CHARS.issuperset(local)
+        and _EMAIL_DOMAIN_CHARS.issuperset(host)
+    ):
         raise ValidationError(f"Invalid email format: {email}")
     
-    return email.strip().lower()
+    return value.lower()
 
 def validate_employee_id(employee_id: str) -> str:
     """Validate employee ID format"""
-    if not employee_id or not isinstance(employee_id, str):
-        raise ValidationError("Employee ID is required and must be a string")
-    
-    employee_id = employee_id.strip()
+    employee_id = _coerce_str(employee_id, "Employee ID is required and must be a string")
     
     # Must be alphanumeric, 3-20 characters
-    if not re.match(r'^[a-zA-Z0-9_-]{3,20}$', employee_id):
+    if not 3 <= len(employee_id) <= 20 or employee_id.translate(_EMPLOYEE_ID_STRIP):
         raise ValidationError("Employee ID must be 3-20 alphanumeric characters, underscores, or hyphens")
     
     return employee_id
@@ -35,8 +78,8 @@ def validate_employee_id(employee_id: str) -> str:
 def validate_camera_id(camera_id: Union[int, str]) -> int:
     """Validate camera ID"""
     try:
-        cam_id = int(camera_id)
-        if cam_id < 0 or cam_id > 99:
+        cam_id = camera_id if type(camera_id) is int else int(camera_id)
+        if not 0 <= cam_id <= 99:
             raise ValidationError("Camera ID must be between 0 and 99")
         return cam_id
     except (ValueError, TypeError):
@@ -44,20 +87,36 @@ def validate_camera_id(camera_id: Union[int, str]) -> int:
 
 def validate_ip_address(ip: str) -> str:
     """Validate IP address format"""
-    if not ip or not isinstance(ip, str):
-        raise ValidationError("IP address is required and must be a string")
+    value = _coerce_str(ip, "IP address is required and must be a string")
     
+    # inet_pton validates in C without building address objects
     try:
-        ipaddress.ip_address(ip.strip())
-        return ip.strip()
-    except ValueError:
-        raise ValidationError(f"Invalid IP address format: {ip}")
+        socket.inet_pton(socket.AF_INET, value)
+        return value
+    except OSError:
+        pass
+    
+    try:
+        socket.inet_pton(socket.AF_INET6, value)
+        return value
+    except OSError:
+        pass
+    
+    # Scoped IPv6 literals (fe80::1%eth0) are only understood by ipaddress
+    if '%' in value:
+        try:
+            ipaddress.ip_address(value)
+            return value
+        except ValueError:
+            pass
+    
+    raise ValidationError(f"Invalid IP address format: {ip}")
 
 def validate_port(port: Union[int, str]) -> int:
     """Validate network port number"""
     try:
-        port_num = int(port)
-        if port_num < 1 or port_num > 65535:
+        port_num = port if type(port) is int else int(port)
+        if not 1 <= port_num <= 65535:
             raise ValidationError("Port must be between 1 and 65535")
         return port_num
     except (ValueError, TypeError):
@@ -65,20 +124,21 @@ def validate_port(port: Union[int, str]) -> int:
 
 def validate_url(url: str, allowed_schemes: List[str] = None) -> str:
     """Validate URL format"""
-    if not url or not isinstance(url, str):
-        raise ValidationError("URL is required and must be a string")
+    url = _coerce_str(url, "URL is required and must be a string")
     
     if allowed_schemes is None:
         allowed_schemes = ['http', 'https', 'rtsp']
     
-    url = url.strip()
+    # Basic URL pattern: known scheme prefix, then a non-empty body without whitespace
+    head = url[:8].lower()
+    if not head.startswith(_URL_SCHEME_PREFIXES):
+        raise ValidationError(f"Invalid URL format: {url}")
     
-    # Basic URL pattern
-    url_pattern = r'^(https?|rtsp)://[^\s/$.?#].[^\s]*$'
-    if not re.match(url_pattern, url, re.IGNORECASE):
+    scheme = head.partition('://')[0]
+    # Match from an offset on the compiled pattern instead of slicing a copy
+    if not _URL_REST_RE.match(url, len(scheme) + 3):
         raise ValidationError(f"Invalid URL format: {url}")
     
-    scheme = url.split('://')[0].lower()
     if scheme not in allowed_schemes:
         raise ValidationError(f"URL scheme must be one of {allowed_schemes}: {url}")
     
@@ -87,13 +147,13 @@ def validate_url(url: str, allowed_schemes: List[str] = None) -> str:
 def validate_resolution(width: Union[int, str], height: Union[int, str]) -> tuple:
     """Validate camera resolution"""
     try:
-        w = int(width)
-        h = int(height)
+        w = width if type(width) is int else int(width)
+        h = height if type(height) is int else int(height)
         
-        if w < 160 or w > 7680:  # Min 160p, Max 8K
+        if not 160 <= w <= 7680:  # Min 160p, Max 8K
             raise ValidationError("Width must be between 160 and 7680 pixels")
         
-        if h < 120 or h > 4320:  # Min 120p, Max 8K
+        if not 120 <= h <= 4320:  # Min 120p, Max 8K
             raise ValidationError("Height must be between 120 and 4320 pixels")
         
         return (w, h)
@@ -103,8 +163,8 @@ def validate_resolution(width: Union[int, str], height: Union[int, str]) -> tupl
 def validate_fps(fps: Union[int, str, float]) -> int:
     """Validate frames per second"""
     try:
-        fps_val = int(float(fps))
-        if fps_val < 1 or fps_val > 120:
+        fps_val = fps if type(fps) is int else int(float(fps))
+        if not 1 <= fps_val <= 120:
             raise ValidationError("FPS must be between 1 and 120")
         return fps_val
     except (ValueError, TypeError):
@@ -114,7 +174,7 @@ def validate_percentage(value: Union[int, str, float], field_name: str = "value"
     """Validate percentage value (0-100)"""
     try:
         pct = float(value)
-        if pct < 0 or pct > 100:
+        if not 0 <= pct <= 100:
             raise ValidationError(f"{field_name} must be between 0 and 100")
         return pct
     except (ValueError, TypeError):
@@ -124,7 +184,7 @@ def validate_threshold(value: Union[int, str, float], field_name: str = "thresho
     """Validate threshold value (0.0-1.0)"""
     try:
         thresh = float(value)
-        if thresh < 0.0 or thresh > 1.0:
+        if not 0.0 <= thresh <= 1.0:
             raise ValidationError(f"{field_name} must be between 0.0 and 1.0")
         return thresh
     except (ValueError, TypeError):
@@ -132,27 +192,21 @@ def validate_threshold(value: Union[int, str, float], field_name: str = "thresho
 
 def validate_date_string(date_str: str, field_name: str = "date") -> datetime:
     """Validate date string in ISO format"""
-    if not date_str or not isinstance(date_str, str):
-        raise ValidationError(f"{field_name} is required and must be a string")
+    value = _coerce_str(date_str, f"{field_name} is required and must be a string")
+    match = _ISO_DATE_RE.match(value)
+    if not match:
+        raise ValidationError(f"Invalid date format for {field_name}: {date_str}")
     
+    # Built from the fields directly since fromisoformat needs two-digit fields;
+    # a trailing Z is ignored so results stay naive, as before
+    year, month, day, hour, minute, second, fraction = match.groups()
     try:
-        # Try multiple common formats
-        formats = [
-            "%Y-%m-%d",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S.%f",
-            "%Y-%m-%dT%H:%M:%SZ",
-            "%Y-%m-%dT%H:%M:%S.%fZ"
-        ]
-        
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str.strip(), fmt)
-            except ValueError:
-                continue
-        
-        raise ValueError("No valid format found")
-    
+        if hour is None:
+            return datetime(int(year), int(month), int(day))
+        # %f semantics: ".5" is 500000 microseconds
+        microsecond = int(fraction.ljust(6, '0')) if fraction else 0
+        return datetime(int(year), int(month), int(day),
+                        int(hour), int(minute), int(second), microsecond)
     except ValueError:
         raise ValidationError(f"Invalid date format for {field_name}: {date_str}")
 
@@ -167,24 +221,35 @@ def validate_password_strength(password: str) -> str:
     if len(password) > 128:
         raise ValidationError("Password must not exceed 128 characters")
     
-    # Check for at least one uppercase, lowercase, digit
-    if not re.search(r'[A-Z]', password):
-        raise ValidationError("Password must contain at least one uppercase letter")
+    # Check for at least one uppercase, lowercase, digit in a single pass
+    has_upper = has_lower = has_digit = False
+    for ch in password:
+        if 'A' <= ch <= 'Z':
+            has_upper = True
+        elif 'a' <= ch <= 'z':
+            has_lower = True
+        elif ch.isdecimal():
+            has_digit = True
+        else:
+            continue
+        if has_upper and has_lower and has_digit:
+            break
     
-    if not re.search(r'[a-z]', password):
+    # Most frequent failure first: missing digit, then lowercase, then uppercase
+    if not has_digit:
+        raise ValidationError("Password must contain at least one digit")
+    
+    if not has_lower:
         raise ValidationError("Password must contain at least one lowercase letter")
     
-    if not re.search(r'\d', password):
-        raise ValidationError("Password must contain at least one digit")
+    if not has_upper:
+        raise ValidationError("Password must contain at least one uppercase letter")
     
     return password
 
 def validate_username(username: str) -> str:
     """Validate username format"""
-    if not username or not isinstance(username, str):
-        raise ValidationError("Username is required and must be a string")
-    
-    username = username.strip()
+    username = _coerce_str(username, "Username is required and must be a string")
     
     if len(username) < 3:
         raise ValidationError("Username must be at least 3 characters long")
@@ -193,34 +258,26 @@ def validate_username(username: str) -> str:
         raise ValidationError("Username must not exceed 50 characters")
     
     # Must be alphanumeric with underscores/dots
-    if not re.match(r'^[a-zA-Z0-9._-]+$', username):
+    if username.translate(_USERNAME_STRIP):
         raise ValidationError("Username can only contain letters, numbers, dots, underscores, and hyphens")
     
     return username
 
 def validate_role(role: str) -> str:
     """Validate user role"""
-    if not role or not isinstance(role, str):
-        raise ValidationError("Role is required and must be a string")
-    
-    valid_roles = ['employee', 'admin', 'super_admin']
-    role = role.strip().lower()
+    role = _coerce_str(role, "Role is required and must be a string").lower()
     
-    if role not in valid_roles:
-        raise ValidationError(f"Role must be one of: {', '.join(valid_roles)}")
+    if role not in _VALID_ROLE_SET:
+        raise ValidationError(f"Role must be one of: {', '.join(_VALID_ROLES)}")
     
     return role
 
 def validate_camera_type(camera_type: str) -> str:
     """Validate camera type"""
-    if not camera_type or not isinstance(camera_type, str):
-        raise ValidationError("Camera type is required and must be a string")
+    camera_type = _coerce_str(camera_type, "Camera type is required and must be a string").lower()
     
-    valid_types = ['usb', 'ip', 'rtsp', 'onvif', 'builtin']
-    camera_type = camera_type.strip().lower()
-    
-    if camera_type not in valid_types:
-        raise ValidationError(f"Camera type must be one of: {', '.join(valid_types)}")
+    if camera_type not in _VALID_CAMERA_TYPE_SET:
+        raise ValidationError(f"Camera type must be one of: {', '.join(_VALID_CAMERA_TYPES)}")
     
     return camera_type
 
@@ -235,21 +292,24 @@ def validate_file_size(file_size: int, max_size_mb: int = 10) -> int:
     
     return file_size
 
+@lru_cache(maxsize=64)
+def _normalize_extensions(allowed_extensions: tuple) -> tuple:
+    """Normalize an extension whitelist once per distinct whitelist"""
+    normalized = tuple(ext.lower().lstrip('.') for ext in allowed_extensions)
+    return normalized, frozenset(normalized)
+
 def validate_file_extension(filename: str, allowed_extensions: List[str]) -> str:
     """Validate file extension"""
-    if not filename or not isinstance(filename, str):
-        raise ValidationError("Filename is required and must be a string")
-    
-    filename = filename.strip()
+    filename = _coerce_str(filename, "Filename is required and must be a string")
     
     if '.' not in filename:
         raise ValidationError("Filename must have an extension")
     
-    extension = filename.split('.')[-1].lower()
-    allowed_extensions = [ext.lower().lstrip('.') for ext in allowed_extensions]
+    extension = filename.rpartition('.')[2].lower()
+    allowed_list, allowed_set = _normalize_extensions(tuple(allowed_extensions))
     
-    if extension not in allowed_extensions:
-        raise ValidationError(f"File extension must be one of: {', '.join(allowed_extensions)}")
+    if extension not in allowed_set:
+        raise ValidationError(f"File extension must be one of: {', '.join(allowed_list)}")
     
     return filename
 
@@ -263,9 +323,9 @@ def sanitize_string(value: str, max_length: int = 255, allow_html: bool = False)
     if len(value) > max_length:
         raise ValidationError(f"String exceeds maximum length of {max_length} characters")
     
-    if not allow_html:
-        # Remove potential HTML/script tags
-        value = re.sub(r'<[^>]*>', '', value)
+    # Remove potential HTML/script tags (skip the regex when no tag can be present)
+    if not allow_html and '<' in value:
+        value = _HTML_TAG_RE.sub('', value)
     
     return value
 
@@ -286,11 +346,62 @@ def validate_pagination(page: Union[int, str], page_size: Union[int, str]) -> tu
         raise ValidationError("Page and page_size must be valid integers")
 
 # Batch validation function
-def validate_request_data(data: Dict[str, Any], validation_rules: Dict[str, Any]) -> Dict[str, Any]:
+_MISSING = object()
+
+class CompiledSchema:
+    """Validation rules pre-extracted into flat tuples for repeated use"""
+    
+    __slots__ = ('fields',)
+    
+    def __init__(self, validation_rules: Dict[str, Any]):
+        fields = []
+        for field, rules in validation_rules.items():
+            validator = rules.get('validator')
+            fields.append((
+                field,
+                bool(rules.get('required', False)),
+                rules.get('type') or None,
+                validator if callable(validator) else None,
+                rules.get('default', _MISSING),
+            ))
+        self.fields = tuple(fields)
+
+def compile_schema(validation_rules: Dict[str, Any]) -> CompiledSchema:
+    """Compile validation rules once so hot endpoints can reuse them"""
+    return CompiledSchema(validation_rules)
+
+# Compiled forms of plain-dict rules, keyed by id() of the dict. Each entry
+# keeps its dict alive so the id cannot be reused while the entry exists.
+_SCHEMA_CACHE_SIZE = 128
+_schema_cache: Dict[int, tuple] = {}
+_schema_cache_lock = threading.Lock()
+
+def _compiled_rules(validation_rules: Dict[str, Any]) -> CompiledSchema:
+    """Return the cached CompiledSchema for a rules dict, compiling it on first use
+
+    Rules dicts are expected to be constants; a dict mutated after its first
+    use keeps its original compiled form.
+    """
+    entry = _schema_cache.get(id(validation_rules))
+    if entry is not None and entry[0] is validation_rules:
+        return entry[1]
+    
+    compiled = CompiledSchema(validation_rules)
+    with _schema_cache_lock:
+        if len(_schema_cache) >= _SCHEMA_CACHE_SIZE:
+            # Evict the oldest entry; dicts built per call never hit anyway
+            del _schema_cache[next(iter(_schema_cache))]
+        _schema_cache[id(validation_rules)] = (validation_rules, compiled)
+    return compiled
+
+def validate_request_data(
+    data: Dict[str, Any],
+    validation_rules: Union[Dict[str, Any], CompiledSchema]
+) -> Dict[str, Any]:
     """
     Validate request data against validation rules
     
-    validation_rules format:
+    validation_rules format (or a CompiledSchema built from it):
     {
         'field_name': {
             'required': True/False,
@@ -300,34 +411,35 @@ def validate_request_data(data: Dict[str, Any], validation_rules: Dict[str, Any]
         }
     }
     """
+    if not isinstance(validation_rules, CompiledSchema):
+        validation_rules = _compiled_rules(validation_rules)
+    
     validated_data = {}
+    get = data.get
     
-    for field, rules in validation_rules.items():
-        value = data.get(field)
+    for field, required, expected_type, validator, default in validation_rules.fields:
+        value = get(field)
         
-        # Check if required
-        if rules.get('required', False) and (value is None or value == ''):
-            raise ValidationError(f"Field '{field}' is required")
-        
-        # Use default if not provided
-        if value is None and 'default' in rules:
-            value = rules['default']
-        
-        # Skip validation if value is None and not required
         if value is None:
-            continue
+            if required:
+                raise ValidationError(f"Field '{field}' is required")
+            # Use default if provided, otherwise skip the field
+            if default is _MISSING or default is None:
+                continue
+            value = default
+        elif required and value == '':
+            raise ValidationError(f"Field '{field}' is required")
         
-        # Type validation
-        expected_type = rules.get('type')
-        if expected_type and not isinstance(value, expected_type):
+        # Type validation (exact type match skips the isinstance walk)
+        if (expected_type is not None and type(value) is not expected_type
+                and not isinstance(value, expected_type)):
             try:
                 value = expected_type(value)
             except (ValueError, TypeError):
                 raise ValidationError(f"Field '{field}' must be of type {expected_type.__name__}")
         
         # Custom validator
-        validator = rules.get('validator')
-        if validator and callable(validator):
+        if validator is not None:
             value = validator(value)
         
         validated_data[field] = value
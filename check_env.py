@@ -28,27 +28,53 @@ def load_all_env_files():
             print(f"⚠️ Missing: {env_file}")
     print()
 
+# (title, rule width, [(variable, display mode)]) for each configuration group;
+# display mode is None (show as-is), 'hide' (mask fully) or 'truncate' (first 10 chars)
+_DISPLAY_CONFIG = {
+    'database': ("🗄️ Database Configuration:", 30, [
+        ('DB_HOST', None), ('DB_PORT', None), ('DB_NAME', None),
+        ('DB_USER', None), ('DB_PASSWORD', 'hide'),
+    ]),
+    'security': ("🔐 Security Configuration:", 30, [
+        ('SECRET_KEY', 'truncate'), ('ALGORITHM', None), ('ACCESS_TOKEN_EXPIRE_MINUTES', None),
+    ]),
+    'face_recognition': ("👤 Face Recognition Configuration:", 40, [
+        ('FACE_RECOGNITION_TOLERANCE', None), ('FACE_DETECTION_MODEL', None),
+        ('FACE_ENCODING_MODEL', None), ('DEFAULT_CAMERA_ID', None),
+    ]),
+    'frontend': ("🌐 Frontend Configuration:", 30, [
+        ('REACT_APP_API_URL', None), ('REACT_APP_API_BASE_URL', None), ('GENERATE_SOURCEMAP', None),
+    ]),
+}
+
+def print_config_group(group, env=None):
+    """Print one configuration group from _DISPLAY_CONFIG"""
+    if env is None:
+        env = os.environ
+    
+    title, rule_width, fields = _DISPLAY_CONFIG[group]
+    print(title)
+    print("-" * rule_width)
+    
+    for var, mode in fields:
+        value = env.get(var, 'NOT SET')
+        if value != 'NOT SET':
+            if mode == 'hide':
+                value = '*' * len(value)  # Hide password
+            elif mode == 'truncate' and len(value) > 10:
+                value = value[:10] + '...'
+        print(f"  {var}: {value}")
+
 def check_database_config():
     """Check database configuration"""
-    print("🗄️ Database Configuration:")
-    print("-" * 30)
-    
-    db_vars = [
-        'DB_HOST', 'DB_PORT', 'DB_NAME', 'DB_USER', 'DB_PASSWORD'
-    ]
-    
-    for var in db_vars:
-        value = os.getenv(var, 'NOT SET')
-        if var == 'DB_PASSWORD' and value != 'NOT SET':
-            value = '*' * len(value)  # Hide password
-        print(f"  {var}: {value}")
+    env = os.environ
+    print_config_group('database', env)
     
     # Test database URL construction
-    db_host = os.getenv('DB_HOST', 'localhost')
-    db_port = os.getenv('DB_PORT', '5432')
-    db_name = os.getenv('DB_NAME', 'frs_db')
-    db_user = os.getenv('DB_USER', 'postgres')
-    db_password = os.getenv('DB_PASSWORD', 'password')
+    db_host = env.get('DB_HOST', 'localhost')
+    db_port = env.get('DB_PORT', '5432')
+    db_name = env.get('DB_NAME', 'frs_db')
+    db_user = env.get('DB_USER', 'postgres')
     
     db_url = f"postgresql://{db_user}:***@{db_host}:{db_port}/{db_name}"
     print(f"  DATABASE_URL: {db_url}")
@@ -56,47 +82,17 @@ def check_database_config():
 
 def check_security_config():
     """Check security configuration"""
-    print("🔐 Security Configuration:")
-    print("-" * 30)
-    
-    security_vars = [
-        'SECRET_KEY', 'ALGORITHM', 'ACCESS_TOKEN_EXPIRE_MINUTES'
-    ]
-    
-    for var in security_vars:
-        value = os.getenv(var, 'NOT SET')
-        if var == 'SECRET_KEY' and value != 'NOT SET':
-            value = value[:10] + '...' if len(value) > 10 else value
-        print(f"  {var}: {value}")
+    print_config_group('security')
     print()
 
 def check_face_recognition_config():
     """Check face recognition configuration"""
-    print("👤 Face Recognition Configuration:")
-    print("-" * 40)
-    
-    face_vars = [
-        'FACE_RECOGNITION_TOLERANCE', 'FACE_DETECTION_MODEL', 
-        'FACE_ENCODING_MODEL', 'DEFAULT_CAMERA_ID'
-    ]
-    
-    for var in face_vars:
-        value = os.getenv(var, 'NOT SET')
-        print(f"  {var}: {value}")
+    print_config_group('face_recognition')
     print()
 
 def check_frontend_config():
     """Check frontend configuration"""
-    print("🌐 Frontend Configuration:")
-    print("-" * 30)
-    
-    frontend_vars = [
-        'REACT_APP_API_URL', 'REACT_APP_API_BASE_URL', 'GENERATE_SOURCEMAP'
-    ]
-    
-    for var in frontend_vars:
-        value = os.getenv(var, 'NOT SET')
-        print(f"  {var}: {value}")
+    print_config_group('frontend')
     print()
 
 def check_file_paths():
@@ -109,8 +105,19 @@ def check_file_paths():
         'backend/logs', 'backend/uploads', 'backend/face_images'
     ]
     
+    # One scandir per parent directory instead of a stat per entry
+    existing = {}
+    for directory in directories:
+        parent = os.path.dirname(directory) or '.'
+        if parent not in existing:
+            try:
+                with os.scandir(parent) as entries:
+                    existing[parent] = {entry.name for entry in entries if entry.is_dir()}
+            except OSError:
+                existing[parent] = set()
+    
     for directory in directories:
-        if os.path.exists(directory):
+        if os.path.basename(directory) in existing[os.path.dirname(directory) or '.']:
             print(f"  ✅ {directory}")
         else:
             print(f"  ❌ {directory} (missing)")
@@ -126,10 +133,8 @@ def validate_required_vars():
         'REACT_APP_API_URL'
     ]
     
-    missing_vars = []
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
+    env = os.environ
+    missing_vars = [var for var in required_vars if not env.get(var)]
     
     if missing_vars:
         print(f"  ❌ Missing required variables: {', '.join(missing_vars)}")
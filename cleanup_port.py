@@ -4,18 +4,20 @@ Port Cleanup Utility for Face Recognition Attendance System
 Helps clean up port conflicts by killing processes using specific ports
 """
 
-import sys
-import subprocess
 import argparse
 import socket
+import psutil
 
 def check_port_available(host, port):
-    """Check if a port is available"""
+    """Check if a port is available (nothing accepts connections on it)"""
+    # Wildcard addresses cannot be connected to on every platform
+    probe_host = "127.0.0.1" if host in ("", "0.0.0.0") else host
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind((host, port))
-            return True
+            s.settimeout(0.1)
+            return s.connect_ex((probe_host, port)) != 0
     except OSError:
+        # An unresolvable host or socket failure proves nothing; assume in use
         return False
 
 def kill_process_on_port(port):
@@ -23,37 +25,23 @@ def kill_process_on_port(port):
     try:
         processes_killed = 0
         
-        if sys.platform == "win32":
-            # Windows command
-            cmd = f"netstat -ano | findstr :{port}"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            if result.stdout:
-                lines = result.stdout.strip().split('\n')
-                for line in lines:
-                    if f":{port}" in line and "LISTENING" in line:
-                        parts = line.split()
-                        if len(parts) >= 5:
-                            pid = parts[-1]
-                            kill_result = subprocess.run(f"taskkill /f /pid {pid}", shell=True, capture_output=True)
-                            if kill_result.returncode == 0:
-                                print(f"✅ Killed process {pid} using port {port}")
-                                processes_killed += 1
-                            else:
-                                print(f"❌ Failed to kill process {pid}")
-        else:
-            # Unix/Linux command
-            cmd = f"lsof -ti:{port}"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            if result.stdout:
-                pids = result.stdout.strip().split('\n')
-                for pid in pids:
-                    if pid.strip():
-                        kill_result = subprocess.run(f"kill -9 {pid}", shell=True, capture_output=True)
-                        if kill_result.returncode == 0:
-                            print(f"✅ Killed process {pid} using port {port}")
-                            processes_killed += 1
-                        else:
-                            print(f"❌ Failed to kill process {pid}")
+        # Query the socket table directly instead of shelling out to netstat/lsof
+        pids = {
+            conn.pid
+            for conn in psutil.net_connections(kind='tcp')
+            if conn.pid and conn.laddr and conn.laddr.port == port
+            and conn.status == psutil.CONN_LISTEN
+        }
+        
+        for pid in pids:
+            try:
+                psutil.Process(pid).kill()
+                print(f"✅ Killed process {pid} using port {port}")
+                processes_killed += 1
+            except psutil.NoSuchProcess:
+                pass
+            except psutil.AccessDenied:
+                print(f"❌ Failed to kill process {pid}")
         
         if processes_killed == 0:
             print(f"ℹ️ No processes found using port {port}")
@@ -14,24 +14,38 @@ import psutil
 import socket
 import time
 import gc
+import shutil
 from pathlib import Path
 
-def check_and_kill_port(port):
+def get_listening_pids_by_port():
+    """Scan listening TCP sockets once and index their PIDs by local port"""
+    by_port = {}
+    for conn in psutil.net_connections(kind='tcp'):
+        if conn.status == psutil.CONN_LISTEN and conn.pid:
+            pids = by_port.setdefault(conn.laddr.port, [])
+            if conn.pid not in pids:
+                pids.append(conn.pid)
+    return by_port
+
+def check_and_kill_port(port, listeners=None):
     """Check if port is in use and kill the process using it"""
     try:
-        for conn in psutil.net_connections():
-            if conn.laddr.port == port and conn.status == psutil.CONN_LISTEN:
-                try:
-                    process = psutil.Process(conn.pid)
-                    print(f"Killing process {conn.pid} ({process.name()}) using port {port}")
-                    process.terminate()
-                    time.sleep(2)
-                    if process.is_running():
-                        process.kill()
-                    return True
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-        return False
+        if listeners is None:
+            listeners = get_listening_pids_by_port()
+        
+        killed = False
+        for pid in listeners.get(port, []):
+            try:
+                process = psutil.Process(pid)
+                print(f"Killing process {pid} ({process.name()}) using port {port}")
+                process.terminate()
+                time.sleep(2)
+                if process.is_running():
+                    process.kill()
+                killed = True
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return killed
     except Exception as e:
         print(f"Error checking port {port}: {e}")
         return False
@@ -120,26 +134,33 @@ def cleanup_temp_files():
     print("🧹 Cleaning up temporary files...")
     
     try:
-        # Clean up Python cache files
-        for root, dirs, files in os.walk('.'):
-            # Remove __pycache__ directories
-            if '__pycache__' in dirs:
-                import shutil
-                pycache_path = os.path.join(root, '__pycache__')
-                shutil.rmtree(pycache_path, ignore_errors=True)
-                print(f"Removed: {pycache_path}")
-            
-            # Remove .pyc files
-            for file in files:
-                if file.endswith('.pyc'):
-                    pyc_path = os.path.join(root, file)
-                    try:
-                        os.remove(pyc_path)
-                        print(f"Removed: {pyc_path}")
-                    except:
-                        pass
+        removed_dirs = 0
+        removed_files = 0
         
-        print("Temporary file cleanup complete")
+        # Single scandir walk; DirEntry type checks avoid an extra stat per entry
+        pending = ['.']
+        while pending:
+            # Like os.walk, skip directories that are unreadable or vanish mid-walk
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name == '__pycache__':
+                                shutil.rmtree(entry.path, ignore_errors=True)
+                                removed_dirs += 1
+                            elif entry.name not in ('.git', 'node_modules'):
+                                pending.append(entry.path)
+                        elif entry.name.endswith('.pyc'):
+                            try:
+                                os.remove(entry.path)
+                                removed_files += 1
+                            except OSError:
+                                pass
+            except OSError:
+                continue
+        
+        print(f"Temporary file cleanup complete "
+              f"({removed_dirs} __pycache__ directories, {removed_files} stray .pyc files removed)")
         
     except Exception as e:
         print(f"Error during cleanup: {e}")
@@ -167,8 +188,13 @@ def main():
     # Check and clean up common ports
     common_ports = [8000, 8001, 8080, 3000, 5000]
     print("Checking for port conflicts...")
+    try:
+        listeners = get_listening_pids_by_port()
+    except Exception as e:
+        print(f"Error scanning ports: {e}")
+        listeners = {}
     for port in common_ports:
-        if check_and_kill_port(port):
+        if check_and_kill_port(port, listeners):
             print(f"Cleaned up port {port}")
         else:
             print(f"Port {port} is free")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Launcher Helpers
+Shared process supervision and dependency-check caching for the start_* scripts.
+"""
+
+import os
+import sys
+import site
+import json
+import time
+import signal
+import socket
+import hashlib
+import platform
+import importlib.util
+import tempfile
+import selectors
+import subprocess
+from pathlib import Path
+
+def select_server_impl():
+    """Pick uvicorn's event loop and HTTP parser, preferring the compiled ones"""
+    # uvloop and httptools ship with uvicorn[standard]; uvloop has no Windows build
+    has_uvloop = platform.system() != "Windows" and importlib.util.find_spec("uvloop") is not None
+    has_httptools = importlib.util.find_spec("httptools") is not None
+    return ("uvloop" if has_uvloop else "asyncio"), ("httptools" if has_httptools else "h11")
+
+# Marker files recording that a dependency check passed in a given environment
+DEPS_CACHE_DIR = Path.home() / ".cache" / "face4"
+
+def deps_marker(packages):
+    """Return the marker path for `packages` in the current interpreter environment"""
+    # site-packages changes on every pip install/uninstall, which invalidates the marker
+    site_dirs = [d for d in site.getsitepackages() if os.path.isdir(d)]
+    fingerprint = "|".join([sys.executable, *packages, *(str(os.path.getmtime(d)) for d in site_dirs)])
+    key = hashlib.sha1(fingerprint.encode()).hexdigest()
+    return DEPS_CACHE_DIR / f"deps-{key}.ok"
+
+def store_deps_marker(marker, packages):
+    """Record a successful dependency check; failures to write are harmless"""
+    try:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.write_text(json.dumps({"executable": sys.executable, "packages": list(packages)}))
+    except OSError:
+        pass
+
+# A successful database probe is trusted for this long on quick restarts
+DB_CHECK_TTL = 60
+
+# ...and for this long in a --reload development session
+DB_CHECK_RELOAD_TTL = 600
+
+def db_check_marker():
+    """Marker path for the current database settings, computed without importing the app"""
+    env_file = Path(__file__).parent / "backend" / ".env"
+    env_bytes = env_file.read_bytes() if env_file.is_file() else b""
+    settings_key = "|".join(os.environ.get(k, "") for k in ("DB_HOST", "DB_PORT", "DB_NAME", "DB_USER", "DB_PASSWORD"))
+    key = hashlib.sha1(env_bytes + settings_key.encode()).hexdigest()
+    return Path(tempfile.gettempdir()) / f"face4_db_ok_{key}"
+
+def db_checked_recently(marker, ttl=DB_CHECK_TTL):
+    """True if the database probe behind `marker` succeeded within ttl seconds"""
+    try:
+        return time.time() - marker.stat().st_mtime < ttl
+    except OSError:
+        return False
+
+def touch_marker(marker):
+    """Refresh a marker's timestamp; failures to write are harmless"""
+    try:
+        marker.touch()
+    except OSError:
+        pass
+
+def wait_for_exit(process, timeout=None):
+    """Block until the child exits or the timeout elapses; True if it exited"""
+    # On Linux 5.3+ a pidfd becomes readable when the child exits, so we can
+    # sleep in select() instead of polling the process
+    if hasattr(os, 'pidfd_open'):
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except OSError:
+            pidfd = None  # Already reaped or unsupported kernel
+        if pidfd is not None:
+            try:
+                with selectors.DefaultSelector() as selector:
+                    selector.register(pidfd, selectors.EVENT_READ)
+                    if not selector.select(timeout):
+                        return False
+            finally:
+                os.close(pidfd)
+            process.wait()
+            return True
+    
+    try:
+        process.wait(timeout=timeout)
+        return True
+    except subprocess.TimeoutExpired:
+        return False
+
+def _signal_process(process, sig):
+    """Signal the child's whole process group when it leads one, else just the child"""
+    try:
+        if os.name == "posix" and os.getpgid(process.pid) == process.pid:
+            # npm start / uvicorn spawn their own children; reach them too
+            os.killpg(process.pid, sig)
+        else:
+            process.send_signal(sig)
+    except ProcessLookupError:
+        pass
+
+def stop_process(process, timeout=5.0):
+    """Terminate a child, escalating to SIGKILL if it does not exit within timeout"""
+    if process.poll() is not None:
+        return
+    _signal_process(process, signal.SIGTERM)
+    if not wait_for_exit(process, timeout=timeout):
+        _signal_process(process, signal.SIGKILL if os.name == "posix" else signal.SIGTERM)
+        wait_for_exit(process, timeout=2.0)
+
+def port_in_use(host, port):
+    """True if something already accepts connections on host:port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(0.25)
+        return s.connect_ex((host, port)) == 0
+
+def wait_for_port(process, host, port, timeout=30.0):
+    """Wait until the child accepts connections on host:port; False if it exits first
+
+    Callers should check port_in_use() before spawning: a stale server on the
+    port would otherwise answer for a child that is about to fail to bind.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        # Only a live child counts; the listener may be someone else's
+        if port_in_use(host, port) and process.poll() is None:
+            return True
+        # Back off between probes, waking immediately if the child dies
+        if wait_for_exit(process, timeout=delay):
+            return False
+        delay = min(delay * 1.5, 0.5)
+    # Still starting after the deadline; treat a live process as started
+    return process.poll() is None
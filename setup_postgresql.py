@@ -6,55 +6,95 @@ Helps create database and user for the application
 
 import os
 import sys
-import subprocess
+import socket
+from pathlib import Path
+from contextlib import contextmanager
 import psycopg2
+from psycopg2 import errors, sql
+from psycopg2 import pool as pg_pool
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
-load_dotenv('backend/.env')
+if Path('backend/.env').is_file():
+    load_dotenv('backend/.env')
+
+# Database settings, read from the environment once
+DB_CONFIG = {
+    key: os.environ.get(key, default)
+    for key, default in (
+        ('DB_HOST', 'localhost'),
+        ('DB_PORT', '5432'),
+        ('DB_NAME', 'frs_db'),
+        ('DB_USER', 'postgres'),
+        ('DB_PASSWORD', 'password'),
+    )
+}
+
+# Connection pools keyed by (host, port, database, user)
+_POOLS = {}
 
 def check_postgresql_service():
-    """Check if PostgreSQL service is running"""
+    """Check if PostgreSQL is accepting connections"""
+    # Probe the port directly rather than spawning systemctl/pg_isready; it is
+    # faster and checks connectivity instead of unit state
+    host = DB_CONFIG['DB_HOST']
+    port = int(DB_CONFIG['DB_PORT'])
     try:
-        result = subprocess.run(['systemctl', 'is-active', 'postgresql'], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ PostgreSQL service is running")
-            return True
-        else:
-            print("❌ PostgreSQL service is not running")
-            print("💡 Try: sudo systemctl start postgresql")
-            return False
-    except FileNotFoundError:
-        print("⚠️ systemctl not found. Checking if PostgreSQL is running another way...")
-        try:
-            result = subprocess.run(['pg_isready'], capture_output=True, text=True)
-            if result.returncode == 0:
-                print("✅ PostgreSQL is running")
-                return True
-            else:
-                print("❌ PostgreSQL is not running")
-                return False
-        except FileNotFoundError:
-            print("❌ PostgreSQL tools not found. Please install PostgreSQL.")
-            return False
+        with socket.create_connection((host, port), timeout=1.0):
+            pass
+        print(f"✅ PostgreSQL is running on {host}:{port}")
+        return True
+    except OSError as e:
+        print(f"❌ PostgreSQL is not reachable on {host}:{port}: {e}")
+        print("💡 Try: sudo systemctl start postgresql")
+        return False
+
+def get_pool(database, user, password, host='localhost', port=5432):
+    """Return the shared connection pool for a set of credentials, creating it on first use"""
+    key = (host, str(port), database, user)
+    conn_pool = _POOLS.get(key)
+    if conn_pool is None:
+        conn_pool = pg_pool.SimpleConnectionPool(
+            1, 2,
+            host=host,
+            port=port,
+            database=database,
+            user=user,
+            password=password
+        )
+        _POOLS[key] = conn_pool
+    return conn_pool
+
+@contextmanager
+def borrow_connection(conn_pool, autocommit=False):
+    """Borrow a connection from a pool and always hand it back"""
+    conn = conn_pool.getconn()
+    try:
+        if autocommit:
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        yield conn
+    finally:
+        conn_pool.putconn(conn)
+
+def close_pools():
+    """Close every pooled connection"""
+    for conn_pool in _POOLS.values():
+        conn_pool.closeall()
+    _POOLS.clear()
 
 def connect_as_superuser():
     """Connect to PostgreSQL as superuser"""
     try:
         # Try to connect as postgres user to postgres database
-        conn = psycopg2.connect(
-            host='localhost',
-            port=5432,
+        conn_pool = get_pool(
             database='postgres',
             user='postgres',
             password=''  # Empty password for peer authentication
         )
-        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
         print("✅ Connected to PostgreSQL as superuser")
-        return conn
+        return borrow_connection(conn_pool, autocommit=True)
     except psycopg2.OperationalError as e:
         print(f"❌ Failed to connect as postgres user: {e}")
         print("💡 You might need to:")
@@ -63,75 +103,83 @@ def connect_as_superuser():
         print("   3. Run this script as postgres user: sudo -u postgres python3 setup_postgresql.py")
         return None
 
-def create_database_and_user():
-    """Create database and user for the application"""
-    conn = connect_as_superuser()
-    if not conn:
-        return False
+def bootstrap_tenant(conn, db_name, db_user, db_password):
+    """Create a database and its owner on an open autocommit superuser connection
+
+    The connection is left open so several tenants can be provisioned over it.
+    Neither CREATE DATABASE nor DO blocks can be PREPAREd, so each tenant costs
+    at most two round trips rather than using server-side prepared plans.
+    """
+    print(f"📊 Setting up database: {db_name}")
+    print(f"👤 Setting up user: {db_user}")
     
-    try:
-        cursor = conn.cursor()
-        
-        # Get configuration from environment
-        db_name = os.getenv('DB_NAME', 'frs_db')
-        db_user = os.getenv('DB_USER', 'postgres')
-        db_password = os.getenv('DB_PASSWORD', 'password')
-        
-        print(f"📊 Setting up database: {db_name}")
-        print(f"👤 Setting up user: {db_user}")
-        
-        # Check if database exists
-        cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", (db_name,))
-        db_exists = cursor.fetchone()
-        
-        if not db_exists:
-            print(f"🔄 Creating database: {db_name}")
-            cursor.execute(f'CREATE DATABASE "{db_name}"')
+    with conn.cursor() as cursor:
+        # CREATE DATABASE cannot run inside a transaction block, so instead of a
+        # separate existence query just attempt it and treat a duplicate as success
+        print(f"🔄 Creating database: {db_name}")
+        try:
+            cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(db_name)))
             print(f"✅ Database {db_name} created successfully")
-        else:
+        except errors.DuplicateDatabase:
             print(f"ℹ️ Database {db_name} already exists")
         
-        # Check if user exists (only if not postgres)
+        # Create or update the user and grant privileges in one round trip (only if not postgres)
         if db_user != 'postgres':
-            cursor.execute("SELECT 1 FROM pg_user WHERE usename = %s", (db_user,))
-            user_exists = cursor.fetchone()
+            print(f"🔄 Setting up user {db_user} and granting privileges on {db_name}")
+            del conn.notices[:]
+            cursor.execute(
+                """
+                DO $setup$
+                BEGIN
+                    IF NOT EXISTS (SELECT 1 FROM pg_user WHERE usename = %(user)s) THEN
+                        EXECUTE format('CREATE USER %%I WITH PASSWORD %%L', %(user)s, %(password)s);
+                        RAISE NOTICE 'user_created';
+                    ELSE
+                        EXECUTE format('ALTER USER %%I WITH PASSWORD %%L', %(user)s, %(password)s);
+                        RAISE NOTICE 'user_updated';
+                    END IF;
+                    EXECUTE format('GRANT ALL PRIVILEGES ON DATABASE %%I TO %%I', %(database)s, %(user)s);
+                END
+                $setup$
+                """,
+                {'user': db_user, 'password': db_password, 'database': db_name}
+            )
             
-            if not user_exists:
-                print(f"🔄 Creating user: {db_user}")
-                cursor.execute(f"CREATE USER \"{db_user}\" WITH PASSWORD '{db_password}'")
+            if any('user_created' in notice for notice in conn.notices):
                 print(f"✅ User {db_user} created successfully")
             else:
                 print(f"ℹ️ User {db_user} already exists")
-                print(f"🔄 Updating password for user: {db_user}")
-                cursor.execute(f"ALTER USER \"{db_user}\" WITH PASSWORD '{db_password}'")
                 print(f"✅ Password updated for user {db_user}")
-            
-            # Grant privileges
-            print(f"🔄 Granting privileges to {db_user} on {db_name}")
-            cursor.execute(f'GRANT ALL PRIVILEGES ON DATABASE "{db_name}" TO "{db_user}"')
             print(f"✅ Privileges granted to {db_user}")
-        
-        cursor.close()
-        conn.close()
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error during database setup: {e}")
-        conn.close()
+
+def create_database_and_user():
+    """Create database and user for the application"""
+    superuser = connect_as_superuser()
+    if not superuser:
         return False
+    
+    with superuser as conn:
+        try:
+            # Get configuration from environment
+            bootstrap_tenant(conn, DB_CONFIG['DB_NAME'], DB_CONFIG['DB_USER'], DB_CONFIG['DB_PASSWORD'])
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error during database setup: {e}")
+            return False
 
 def test_application_connection():
     """Test connection with application credentials"""
     try:
-        db_host = os.getenv('DB_HOST', 'localhost')
-        db_port = os.getenv('DB_PORT', '5432')
-        db_name = os.getenv('DB_NAME', 'frs_db')
-        db_user = os.getenv('DB_USER', 'postgres')
-        db_password = os.getenv('DB_PASSWORD', 'password')
+        db_host = DB_CONFIG['DB_HOST']
+        db_port = DB_CONFIG['DB_PORT']
+        db_name = DB_CONFIG['DB_NAME']
+        db_user = DB_CONFIG['DB_USER']
+        db_password = DB_CONFIG['DB_PASSWORD']
         
         print(f"🔍 Testing connection to {db_name} as {db_user}...")
         
-        conn = psycopg2.connect(
+        conn_pool = get_pool(
             host=db_host,
             port=db_port,
             database=db_name,
@@ -139,14 +187,13 @@ def test_application_connection():
             password=db_password
         )
         
-        cursor = conn.cursor()
-        cursor.execute("SELECT version()")
-        version = cursor.fetchone()[0]
-        print(f"✅ Connection successful!")
-        print(f"   PostgreSQL version: {version}")
-        
-        cursor.close()
-        conn.close()
+        with borrow_connection(conn_pool) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version()")
+            version = cursor.fetchone()[0]
+            print(f"✅ Connection successful!")
+            print(f"   PostgreSQL version: {version}")
+            cursor.close()
         return True
         
     except Exception as e:
@@ -157,11 +204,11 @@ def show_connection_info():
     """Show connection information"""
     print("\n📋 Database Connection Information:")
     print("-" * 40)
-    print(f"Host: {os.getenv('DB_HOST', 'localhost')}")
-    print(f"Port: {os.getenv('DB_PORT', '5432')}")
-    print(f"Database: {os.getenv('DB_NAME', 'frs_db')}")
-    print(f"User: {os.getenv('DB_USER', 'postgres')}")
-    print(f"Password: {'*' * len(os.getenv('DB_PASSWORD', 'password'))}")
+    print(f"Host: {DB_CONFIG['DB_HOST']}")
+    print(f"Port: {DB_CONFIG['DB_PORT']}")
+    print(f"Database: {DB_CONFIG['DB_NAME']}")
+    print(f"User: {DB_CONFIG['DB_USER']}")
+    print(f"Password: {'*' * len(DB_CONFIG['DB_PASSWORD'])}")
 
 def main():
     print("🎯 PostgreSQL Setup for Face Recognition Attendance System")
@@ -194,4 +241,7 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        main()
+    finally:
+        close_pools()
\ No newline at end of file
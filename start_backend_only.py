@@ -6,10 +6,14 @@ This script starts only the FastAPI backend without the Face Tracking System.
 
 import os
 import sys
-import subprocess
+import argparse
+import socket
+import threading
 import time
 from pathlib import Path
 
+from launch_helpers import select_server_impl
+
 def setup_environment():
     """Set up environment variables for backend only"""
     print("🔧 Setting up backend environment...")
@@ -17,13 +21,51 @@ def setup_environment():
     # Disable FTS auto-start
     os.environ['FTS_AUTO_START'] = 'false'
     
-    # Set conservative memory settings anyway
-    os.environ['OMP_NUM_THREADS'] = '1'
-    os.environ['MKL_NUM_THREADS'] = '1'
-    os.environ['NUMEXPR_NUM_THREADS'] = '1'
+    # Without FTS the request handlers still do NumPy work, so let BLAS use a few
+    # threads; FACE4_THREADS overrides the default and explicit per-library values win
+    threads = os.environ.get('FACE4_THREADS', str(max(1, (os.cpu_count() or 2) // 2)))
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'NUMEXPR_NUM_THREADS',
+                'OPENBLAS_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS', 'BLIS_NUM_THREADS'):
+        os.environ.setdefault(var, threads)
     
     print("✅ Backend environment configured")
 
+def wait_ready(host, port, timeout=15, stopped=None):
+    """Poll until something accepts TCP connections on host:port
+
+    Gives up early, returning False, once the optional `stopped` event is set.
+    """
+    stopped = stopped or threading.Event()
+    probe_host = "127.0.0.1" if host in ("", "0.0.0.0") else host
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not stopped.is_set():
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.settimeout(0.2)
+            if s.connect_ex((probe_host, port)) == 0:
+                return True
+        stopped.wait(0.05)
+    return False
+
+def report_when_ready(host, port, timeout=15, stopped=None):
+    """Print the startup banner once the server actually accepts connections"""
+    if not wait_ready(host, port, timeout, stopped):
+        if stopped is None or not stopped.is_set():
+            print(f"⚠️ Backend API is not accepting connections on {host}:{port} after {timeout}s")
+        return
+    
+    print("✅ Backend API started successfully!")
+    print(f"🌐 API available at: http://{host}:{port}")
+    print(f"📚 API docs available at: http://{host}:{port}/docs")
+    print("")
+    print("🎛️ Available API endpoints:")
+    print("   • Authentication: /auth/")
+    print("   • Employees: /employees/")
+    print("   • Attendance: /attendance/")
+    print("   • Cameras: /cameras/")
+    print("   • System: /system/")
+    print("")
+    print("🛑 Press Ctrl+C to stop the backend")
+
 def start_backend(host="127.0.0.1", port=8000, reload=False):
     """Start the FastAPI backend only"""
     print("🚀 Starting FastAPI Backend...")
@@ -31,64 +73,69 @@ def start_backend(host="127.0.0.1", port=8000, reload=False):
     try:
         backend_path = Path(__file__).parent / "backend"
         os.chdir(backend_path)
+        sys.path.insert(0, str(backend_path))
         
-        # Build uvicorn command
-        cmd = [
-            sys.executable, "-m", "uvicorn",
-            "app.main:app",
-            "--host", host,
-            "--port", str(port),
-            "--access-log",
-            "--loop", "asyncio",
-            "--workers", "1"  # Single worker for stability
-        ]
+        # Run uvicorn in this interpreter instead of spawning a second one
+        import uvicorn
         
-        if reload:
-            cmd.append("--reload")
+        loop, http = select_server_impl()
         
         print(f"🎯 Starting Backend API on {host}:{port}")
-        print("📝 Command:", " ".join(cmd))
+        print(f"⚙️ Event loop: {loop}, HTTP parser: {http}")
         print("🔄 Face Tracking System is DISABLED")
         print("")
         
-        # Start the backend
-        process = subprocess.Popen(cmd)
+        # Announce readiness as soon as the port accepts connections; the probe
+        # stops waiting once the server has exited
+        server_stopped = threading.Event()
+        threading.Thread(
+            target=report_when_ready,
+            args=(host, port),
+            kwargs={"stopped": server_stopped},
+            name="ReadinessProbe",
+            daemon=True
+        ).start()
         
-        # Wait a bit for server to start
-        time.sleep(3)
+        # Blocks until the server shuts down; uvicorn handles Ctrl+C gracefully
+        try:
+            uvicorn.run(
+                "app.main:app",
+                host=host,
+                port=port,
+                reload=reload,
+                access_log=True,
+                loop=loop,
+                http=http,
+                workers=1  # Single worker for stability
+            )
+        except SystemExit as e:
+            # uvicorn exits instead of raising when startup fails (e.g. the port is taken)
+            if e.code:
+                print(f"❌ Error starting backend: server exited during startup (code {e.code})")
+                return False
+        finally:
+            server_stopped.set()
         
-        # Check if server is running
-        if process.poll() is None:
-            print("✅ Backend API started successfully!")
-            print(f"🌐 API available at: http://{host}:{port}")
-            print(f"📚 API docs available at: http://{host}:{port}/docs")
-            print("")
-            print("🎛️ Available API endpoints:")
-            print("   • Authentication: /auth/")
-            print("   • Employees: /employees/")
-            print("   • Attendance: /attendance/")
-            print("   • Cameras: /cameras/")
-            print("   • System: /system/")
-            print("")
-            print("🛑 Press Ctrl+C to stop the backend")
-            
-            # Wait for the process to complete
-            process.wait()
-        else:
-            print("❌ Backend failed to start")
-            return False
+        print("✅ Backend stopped")
+        return True
             
     except KeyboardInterrupt:
         print("\n🛑 Shutting down backend...")
-        if 'process' in locals():
-            process.terminate()
-            process.wait()
         print("✅ Backend stopped")
         return True
     except Exception as e:
         print(f"❌ Error starting backend: {e}")
         return False
 
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(description="Start Backend API Only")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
+    parser.add_argument("--reload", action="store_true", help="Enable auto-reload")
+    
+    return parser
+
 def main():
     print("🎯 Face Recognition System - Backend API Only")
     print("=" * 50)
@@ -98,13 +145,7 @@ def main():
     print()
     
     # Parse command line arguments
-    import argparse
-    parser = argparse.ArgumentParser(description="Start Backend API Only")
-    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
-    parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
-    parser.add_argument("--reload", action="store_true", help="Enable auto-reload")
-    
-    args = parser.parse_args()
+    args = build_parser().parse_args()
     
     # Start backend
     if start_backend(args.host, args.port, args.reload):
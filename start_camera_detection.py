@@ -6,12 +6,32 @@ This script runs camera discovery and basic detection without the full FTS.
 
 import os
 import sys
+import argparse
 import time
 import signal
 import cv2
 import threading
+import platform
+import functools
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Frames are downscaled to this width before running the face detector
+DETECTION_WIDTH = 320
+
+# Optional YuNet ONNX model; the Haar cascade is used when it is not present
+YUNET_MODEL_PATH = os.environ.get(
+    'YUNET_MODEL_PATH',
+    str(Path(__file__).parent / 'face_detection_yunet_2023mar.onnx')
+)
+
+# Haar cascade shipped with OpenCV, resolved once at import
+CASCADE_PATH = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+
+# Upper bound for opening a network stream while testing connections
+CAMERA_OPEN_TIMEOUT_MS = 2000
+
 def setup_environment():
     """Set up environment for camera detection"""
     print("🔧 Setting up camera detection environment...")
@@ -23,82 +43,177 @@ def setup_environment():
     
     print("✅ Camera detection environment configured")
 
-def discover_onvif_cameras():
-    """Discover ONVIF cameras on the network"""
-    print("🔍 Discovering ONVIF cameras...")
+@functools.lru_cache(maxsize=1)
+def _discovery():
+    """Create the ONVIF discovery helper once and reuse it across scans"""
+    backend_path = Path(__file__).parent / "backend"
+    sys.path.insert(0, str(backend_path))
+    
+    from utils.camera_discovery import ONVIFCameraDiscovery
+    
+    return ONVIFCameraDiscovery()
+
+def discover_onvif_cameras(log=print):
+    """Discover ONVIF cameras on the network, reporting each line through `log`"""
+    log("🔍 Discovering ONVIF cameras...")
     
     try:
-        backend_path = Path(__file__).parent / "backend"
-        sys.path.insert(0, str(backend_path))
-        
-        from utils.camera_discovery import ONVIFCameraDiscovery
-        
-        discovery = ONVIFCameraDiscovery()
+        discovery = _discovery()
         cameras = discovery.discover_cameras(timeout=10)
         
         if cameras:
-            print(f"✅ Found {len(cameras)} ONVIF camera(s):")
+            log(f"✅ Found {len(cameras)} ONVIF camera(s):")
             for i, cam in enumerate(cameras, 1):
-                print(f"   {i}. {cam.name} - {cam.ip}:{cam.port}")
-                print(f"      Manufacturer: {cam.manufacturer}")
-                print(f"      Model: {cam.model}")
-                print(f"      Stream URL: {cam.stream_url}")
-                print()
+                log(f"   {i}. {cam.name} - {cam.ip}:{cam.port}")
+                log(f"      Manufacturer: {cam.manufacturer}")
+                log(f"      Model: {cam.model}")
+                log(f"      Stream URL: {cam.stream_url}")
+                log("")
         else:
-            print("⚠️ No ONVIF cameras discovered")
-            print("💡 Make sure cameras are on the same network and ONVIF is enabled")
+            log("⚠️ No ONVIF cameras discovered")
+            log("💡 Make sure cameras are on the same network and ONVIF is enabled")
         
         return cameras
         
     except Exception as e:
-        print(f"❌ Error discovering cameras: {e}")
+        log(f"❌ Error discovering cameras: {e}")
         return []
 
-def test_camera_connection(camera_url, camera_name="Unknown"):
-    """Test connection to a camera"""
-    print(f"🔌 Testing connection to {camera_name}...")
+def test_camera_connection(camera_url, camera_name="Unknown", log=print):
+    """Test connection to a camera, reporting each line through `log`"""
+    log(f"🔌 Testing connection to {camera_name}...")
     
     try:
-        cap = cv2.VideoCapture(camera_url)
+        if isinstance(camera_url, str) and hasattr(cv2, 'CAP_PROP_OPEN_TIMEOUT_MSEC'):
+            # Bound unreachable streams instead of waiting on FFmpeg's ~30 s default
+            cap = cv2.VideoCapture(
+                camera_url, cv2.CAP_FFMPEG,
+                [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, CAMERA_OPEN_TIMEOUT_MS]
+            )
+        else:
+            cap = cv2.VideoCapture(camera_url)
         
         if cap.isOpened():
             ret, frame = cap.read()
             if ret:
                 height, width = frame.shape[:2]
-                print(f"✅ {camera_name} connected successfully")
-                print(f"   Resolution: {width}x{height}")
+                log(f"✅ {camera_name} connected successfully")
+                log(f"   Resolution: {width}x{height}")
                 
                 # Test a few frames
                 for i in range(5):
                     ret, frame = cap.read()
                     if not ret:
-                        print(f"⚠️ Failed to read frame {i+1}")
+                        log(f"⚠️ Failed to read frame {i+1}")
                         break
                     time.sleep(0.1)
                 
                 cap.release()
                 return True
             else:
-                print(f"❌ {camera_name} opened but cannot read frames")
+                log(f"❌ {camera_name} opened but cannot read frames")
                 cap.release()
                 return False
         else:
-            print(f"❌ Cannot connect to {camera_name}")
+            log(f"❌ Cannot connect to {camera_name}")
             return False
             
     except Exception as e:
-        print(f"❌ Error testing {camera_name}: {e}")
+        log(f"❌ Error testing {camera_name}: {e}")
         return False
 
+@functools.lru_cache(maxsize=1)
+def _face_cascade():
+    """Load the Haar cascade XML once per process; None if it cannot be loaded"""
+    face_cascade = cv2.CascadeClassifier(CASCADE_PATH)
+    return None if face_cascade.empty() else face_cascade
+
+def create_face_detector():
+    """Return a detect(frame) callable, preferring OpenCV's YuNet DNN over the Haar cascade"""
+    if hasattr(cv2, 'FaceDetectorYN') and os.path.isfile(YUNET_MODEL_PATH):
+        detector = cv2.FaceDetectorYN.create(
+            YUNET_MODEL_PATH, '', (DETECTION_WIDTH, DETECTION_WIDTH),
+            score_threshold=0.6,
+            backend_id=cv2.dnn.DNN_BACKEND_OPENCV,
+            target_id=cv2.dnn.DNN_TARGET_CPU
+        )
+        print("✅ Using YuNet DNN face detector")
+        
+        def detect(frame):
+            height, width = frame.shape[:2]
+            detector.setInputSize((width, height))
+            _, faces = detector.detect(frame)
+            return faces if faces is not None else ()
+        
+        return detect
+    
+    face_cascade = _face_cascade()
+    if face_cascade is None:
+        return None
+    print("ℹ️ YuNet model not found, using Haar cascade face detector")
+    
+    # Let OpenCV's transparent API run conversion and detection on an OpenCL device
+    use_opencl = cv2.ocl.haveOpenCL()
+    if use_opencl:
+        cv2.ocl.setUseOpenCL(True)
+        print("✅ OpenCL available, running Haar detection through UMat")
+    
+    def detect(frame):
+        if use_opencl:
+            frame = cv2.UMat(frame)
+        
+        # Convert to grayscale for detection
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return face_cascade.detectMultiScale(
+            gray,
+            scaleFactor=1.2,
+            minNeighbors=4,
+            minSize=(20, 20),
+            flags=cv2.CASCADE_SCALE_IMAGE
+        )
+    
+    return detect
+
+class FrameGrabber(threading.Thread):
+    """Reads one camera continuously and keeps only its most recent frame
+
+    The grabber owns its capture and releases it when the thread exits.
+    """
+    
+    def __init__(self, cap, name, frame_ready):
+        super().__init__(name=f"FrameGrabber-{name}", daemon=True)
+        self.cap = cap
+        self.camera_name = name
+        self.latest = deque(maxlen=1)
+        self._frame_ready = frame_ready
+        self._stop_event = threading.Event()
+    
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                ret, frame = self.cap.read()
+                if not ret:
+                    # Back off briefly instead of spinning on a dead stream
+                    self._stop_event.wait(0.1)
+                    continue
+                self.latest.append(frame)
+                self._frame_ready.set()
+        finally:
+            # Released here so a read still in progress never races the release
+            self.cap.release()
+    
+    def stop(self):
+        self._stop_event.set()
+
 def start_basic_detection(camera_urls):
     """Start basic face detection on cameras"""
     print("🚀 Starting basic face detection...")
     
     try:
-        # Initialize face detector (using OpenCV's built-in detector)
-        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        # Initialize face detector (YuNet when its model is available, else Haar)
+        detect_faces = create_face_detector()
         
-        if face_cascade.empty():
+        if detect_faces is None:
             print("❌ Failed to load face cascade classifier")
             return False
         
@@ -107,6 +222,8 @@ def start_basic_detection(camera_urls):
         for i, url in enumerate(camera_urls):
             cap = cv2.VideoCapture(url)
             if cap.isOpened():
+                # Keep OpenCV's internal queue short so grabbed frames stay fresh
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                 captures.append((cap, f"Camera_{i+1}"))
                 print(f"✅ Opened Camera_{i+1}: {url}")
             else:
@@ -120,45 +237,70 @@ def start_basic_detection(camera_urls):
         print("🛑 Press Ctrl+C to stop detection")
         print("")
         
+        # One grabber thread per camera overlaps stream I/O with detection
+        frame_ready = threading.Event()
+        grabbers = [FrameGrabber(cap, name, frame_ready) for cap, name in captures]
+        for grabber in grabbers:
+            grabber.start()
+        
         # Detection loop
         frame_count = 0
         detection_count = 0
         
+        # Detections are batched per camera and reported at most once a second
+        pending = Counter()
+        last_log = time.monotonic()
+        
         try:
             while True:
-                for cap, name in captures:
-                    ret, frame = cap.read()
-                    if ret:
-                        # Convert to grayscale for detection
-                        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                        
-                        # Detect faces
-                        faces = face_cascade.detectMultiScale(
-                            gray,
-                            scaleFactor=1.1,
-                            minNeighbors=5,
-                            minSize=(30, 30)
-                        )
-                        
-                        if len(faces) > 0:
-                            detection_count += len(faces)
-                            print(f"👤 {name}: Detected {len(faces)} face(s) [Total: {detection_count}]")
+                # Sleep until at least one camera has a new frame
+                frame_ready.wait(timeout=1.0)
+                frame_ready.clear()
                 
-                frame_count += 1
+                for grabber in grabbers:
+                    try:
+                        frame = grabber.latest.pop()
+                    except IndexError:
+                        continue
+                    
+                    # Downscale before detection; cascade cost grows with pixel count
+                    width = frame.shape[1]
+                    if width > DETECTION_WIDTH:
+                        scale = DETECTION_WIDTH / width
+                        frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                    
+                    # Detect faces (boxes are only counted, so no rescaling is needed)
+                    faces = detect_faces(frame)
+                    
+                    if len(faces) > 0:
+                        detection_count += len(faces)
+                        pending[grabber.camera_name] += len(faces)
+                    
+                    frame_count += 1
+                    
+                    # Print status every 100 frames
+                    if frame_count % 100 == 0:
+                        print(f"📊 Processed {frame_count} frames, detected {detection_count} faces total")
                 
-                # Print status every 100 frames
-                if frame_count % 100 == 0:
-                    print(f"📊 Processed {frame_count} frames, detected {detection_count} faces total")
-                
-                time.sleep(0.1)  # Small delay to prevent excessive CPU usage
+                now = time.monotonic()
+                if pending and now - last_log >= 1.0:
+                    summary = ", ".join(f"{name}: {count}" for name, count in pending.items())
+                    print(f"👤 Detected face(s) {summary} [Total: {detection_count}]")
+                    pending.clear()
+                    last_log = now
                 
         except KeyboardInterrupt:
             print("\n🛑 Stopping face detection...")
         
         finally:
             # Clean up
-            for cap, name in captures:
-                cap.release()
+            for grabber in grabbers:
+                grabber.stop()
+            for grabber in grabbers:
+                grabber.join(timeout=1.0)
+                if grabber.is_alive():
+                    # Still blocked in read(); it releases its capture once that returns
+                    print(f"⚠️ {grabber.camera_name} is still closing")
             print("✅ Camera detection stopped")
             
         return True
@@ -167,22 +309,38 @@ def start_basic_detection(camera_urls):
         print(f"❌ Error in face detection: {e}")
         return False
 
-def get_default_cameras():
-    """Get default camera sources"""
+def _probe_usb_camera(index):
+    """Open a USB camera index and report (opened, readable)"""
+    # V4L2 directly skips OpenCV's backend autodetection on Linux
+    if platform.system() == "Linux":
+        cap = cv2.VideoCapture(index, cv2.CAP_V4L2)
+    else:
+        cap = cv2.VideoCapture(index)
+    
+    try:
+        if not cap.isOpened():
+            return False, False
+        ret, _ = cap.read()
+        return True, ret
+    finally:
+        cap.release()
+
+def get_default_cameras(log=print):
+    """Get default camera sources, reporting each line through `log`"""
     default_cameras = []
     
-    # Test USB cameras (0-4)
-    print("🔍 Checking for USB cameras...")
-    for i in range(5):
-        cap = cv2.VideoCapture(i)
-        if cap.isOpened():
-            ret, frame = cap.read()
-            if ret:
-                default_cameras.append(i)
-                print(f"✅ Found USB camera at index {i}")
-            cap.release()
-        else:
+    # Test USB cameras (0-4); each index is a separate device, so probe them concurrently
+    log("🔍 Checking for USB cameras...")
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        probes = list(executor.map(_probe_usb_camera, range(5)))
+    
+    # Keep the original semantics: stop at the first index that cannot be opened
+    for i, (opened, readable) in enumerate(probes):
+        if not opened:
             break
+        if readable:
+            default_cameras.append(i)
+            log(f"✅ Found USB camera at index {i}")
     
     # Add common IP camera URLs for testing
     test_urls = [
@@ -193,19 +351,22 @@ def get_default_cameras():
     
     return default_cameras
 
-def main():
-    print("🎯 Face Recognition System - Camera Detection & Discovery")
-    print("=" * 60)
-    
-    # Parse command line arguments
-    import argparse
+def build_parser():
+    """Build the command line parser"""
     parser = argparse.ArgumentParser(description="Camera Detection & Discovery")
     parser.add_argument("--discover", action="store_true", help="Discover ONVIF cameras")
     parser.add_argument("--test-usb", action="store_true", help="Test USB cameras")
     parser.add_argument("--detect", action="store_true", help="Start face detection")
     parser.add_argument("--camera-url", action="append", help="Add camera URL for testing")
     
-    args = parser.parse_args()
+    return parser
+
+def main():
+    print("🎯 Face Recognition System - Camera Detection & Discovery")
+    print("=" * 60)
+    
+    # Parse command line arguments
+    args = build_parser().parse_args()
     
     # Set up environment
     setup_environment()
@@ -213,18 +374,28 @@ def main():
     
     camera_urls = []
     
-    # Discover ONVIF cameras
-    if args.discover:
-        cameras = discover_onvif_cameras()
+    # ONVIF discovery waits on the network while USB probing waits on local
+    # devices, so run both at once and pay only for the slower of the two.
+    # Each buffers its lines, printed once both are done so they don't interleave
+    if args.discover or args.test_usb:
+        if args.test_usb:
+            print("🔍 Testing USB cameras...")
+        onvif_lines, usb_lines = [], []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            onvif_future = executor.submit(discover_onvif_cameras, onvif_lines.append) if args.discover else None
+            usb_future = executor.submit(get_default_cameras, usb_lines.append) if args.test_usb else None
+            cameras = onvif_future.result() if onvif_future else []
+            usb_cameras = usb_future.result() if usb_future else []
+        
+        for line in onvif_lines + usb_lines:
+            print(line)
+        
+        # Discover ONVIF cameras
         for cam in cameras:
             if cam.stream_url:
                 camera_urls.append(cam.stream_url)
-        print()
-    
-    # Test USB cameras
-    if args.test_usb:
-        print("🔍 Testing USB cameras...")
-        usb_cameras = get_default_cameras()
+        
+        # Test USB cameras
         camera_urls.extend(usb_cameras)
         print()
     
@@ -239,12 +410,20 @@ def main():
     # Test camera connections
     if camera_urls:
         print("🔌 Testing camera connections...")
-        working_cameras = []
-        for url in camera_urls:
-            if test_camera_connection(url, str(url)):
-                working_cameras.append(url)
+        # Probes are I/O bound and OpenCV releases the GIL while opening streams;
+        # each one buffers its lines so the report stays grouped per camera
+        def probe(url):
+            lines = []
+            return test_camera_connection(url, str(url), lines.append), lines
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(camera_urls))) as executor:
+            results = list(executor.map(probe, camera_urls))
+        
+        for _, lines in results:
+            for line in lines:
+                print(line)
         
-        camera_urls = working_cameras
+        camera_urls = [url for url, (working, _) in zip(camera_urls, results) if working]
         print()
     
     # Start detection if requested
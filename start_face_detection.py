@@ -5,13 +5,76 @@ Starts the face detection system by making an API call to the FastAPI server
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import time
 import sys
+import os
+import base64
 from pathlib import Path
 
+# Tokens are cached between runs so `start` followed by `status` logs in once
+TOKEN_CACHE_PATH = Path("~/.face4/token").expanduser()
+TOKEN_EXPIRY_MARGIN = 60  # seconds
+
+# One pooled session so login and the following API call share a connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=2,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+SESSION.headers.update({"Content-Type": "application/json"})
+
+def _token_expiry(token):
+    """Return the exp claim of a JWT without verifying it, or None"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        expiry = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+    except (IndexError, ValueError, AttributeError):
+        return None
+    # A malformed claim (string, bool, null) would break the expiry comparison
+    if isinstance(expiry, bool) or not isinstance(expiry, (int, float)):
+        return None
+    return expiry
+
+def _load_cached_token():
+    """Return the cached token if it is still valid for a while"""
+    try:
+        token = TOKEN_CACHE_PATH.read_text().strip()
+    except OSError:
+        return None
+    
+    expiry = _token_expiry(token)
+    if expiry and expiry > time.time() + TOKEN_EXPIRY_MARGIN:
+        return token
+    return None
+
+def _store_token(token):
+    """Persist a token to the cache file, readable only by the current user"""
+    try:
+        TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(token)
+    except OSError as e:
+        print(f"⚠️ Could not cache authentication token: {e}")
+
+def _clear_cached_token():
+    """Drop a cached token the server no longer accepts"""
+    try:
+        TOKEN_CACHE_PATH.unlink()
+    except OSError:
+        pass
+
 def get_auth_token():
     """Get authentication token for API calls"""
+    cached = _load_cached_token()
+    if cached:
+        return cached
+    
     # You'll need to modify this with actual credentials
     # For now, this is a placeholder
     login_data = {
@@ -20,9 +83,12 @@ def get_auth_token():
     }
     
     try:
-        response = requests.post("http://localhost:8000/auth/login", json=login_data)
+        response = SESSION.post("http://localhost:8000/auth/login", json=login_data)
         if response.status_code == 200:
-            return response.json().get("access_token")
+            token = response.json().get("access_token")
+            if token:
+                _store_token(token)
+            return token
         else:
             print(f"❌ Failed to authenticate: {response.status_code}")
             print(f"Response: {response.text}")
@@ -40,14 +106,11 @@ def start_face_detection():
         print("❌ Authentication failed. Please check your credentials.")
         return False
     
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
+    headers = {"Authorization": f"Bearer {token}"}
     
     try:
         print("🚀 Starting face detection system...")
-        response = requests.post("http://localhost:8000/system/start", headers=headers)
+        response = SESSION.post("http://localhost:8000/system/start", headers=headers)
         
         if response.status_code == 200:
             result = response.json()
@@ -58,6 +121,8 @@ def start_face_detection():
                 print(f"❌ Failed to start: {result.get('message')}")
                 return False
         else:
+            if response.status_code == 401:
+                _clear_cached_token()
             print(f"❌ API call failed: {response.status_code}")
             print(f"Response: {response.text}")
             return False
@@ -75,14 +140,11 @@ def check_system_status():
         print("❌ Authentication failed. Please check your credentials.")
         return False
     
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
+    headers = {"Authorization": f"Bearer {token}"}
     
     try:
         print("📊 Checking system status...")
-        response = requests.get("http://localhost:8000/system/status", headers=headers)
+        response = SESSION.get("http://localhost:8000/system/status", headers=headers)
         
         if response.status_code == 200:
             result = response.json()
@@ -99,6 +161,8 @@ def check_system_status():
                 print(f"❌ Failed to get status: {result.get('message')}")
                 return False
         else:
+            if response.status_code == 401:
+                _clear_cached_token()
             print(f"❌ API call failed: {response.status_code}")
             print(f"Response: {response.text}")
             return False
@@ -6,27 +6,55 @@ This script starts only the React frontend application.
 
 import os
 import sys
+import argparse
+import shutil
+import asyncio
 import subprocess
-import time
 from pathlib import Path
 
+from launch_helpers import port_in_use, stop_process, wait_for_exit, wait_for_port
+
+# Absolute tool paths, resolved against PATH once instead of on every spawn
+NODE = shutil.which("node")
+NPM = shutil.which("npm")
+
+async def _tool_version(executable):
+    """Run `<executable> --version` and return (returncode, output)"""
+    process = await asyncio.create_subprocess_exec(
+        executable, "--version",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    stdout, _ = await process.communicate()
+    return process.returncode, stdout.decode().strip()
+
+async def _probe_node_and_npm(node, npm):
+    """Query node and npm concurrently; npm is a shim that starts its own node"""
+    return await asyncio.gather(_tool_version(node), _tool_version(npm))
+
 def check_node_and_npm():
     """Check if Node.js and npm are available"""
     print("🔍 Checking Node.js and npm...")
     
     try:
+        node, npm = NODE, NPM
+        if node is None or npm is None:
+            raise FileNotFoundError("node/npm")
+        
+        (node_code, node_version), (npm_code, npm_version) = asyncio.run(
+            _probe_node_and_npm(node, npm)
+        )
+        
         # Check Node.js
-        node_result = subprocess.run(["node", "--version"], capture_output=True, text=True)
-        if node_result.returncode == 0:
-            print(f"✅ Node.js: {node_result.stdout.strip()}")
+        if node_code == 0:
+            print(f"✅ Node.js: {node_version}")
         else:
             print("❌ Node.js not found")
             return False
         
         # Check npm
-        npm_result = subprocess.run(["npm", "--version"], capture_output=True, text=True)
-        if npm_result.returncode == 0:
-            print(f"✅ npm: {npm_result.stdout.strip()}")
+        if npm_code == 0:
+            print(f"✅ npm: {npm_version}")
         else:
             print("❌ npm not found")
             return False
@@ -50,12 +78,18 @@ def install_dependencies():
     
     if not node_modules.exists():
         print("📥 Installing frontend dependencies...")
+        
+        # npm ci installs straight from the lockfile without re-resolving the tree
+        if (frontend_path / "package-lock.json").exists():
+            cmd = [NPM or "npm", "ci", "--prefer-offline", "--no-audit", "--progress=false"]
+        else:
+            cmd = [NPM or "npm", "install", "--no-audit", "--progress=false"]
+        
         try:
+            # npm's output goes straight to the terminal instead of being buffered here
             result = subprocess.run(
-                ["npm", "install"], 
+                cmd, 
                 cwd=frontend_path, 
-                capture_output=True, 
-                text=True,
                 timeout=300  # 5 minute timeout
             )
             
@@ -63,7 +97,7 @@ def install_dependencies():
                 print("✅ Dependencies installed successfully")
                 return True
             else:
-                print(f"❌ Failed to install dependencies: {result.stderr}")
+                print(f"❌ Failed to install dependencies (npm exited with code {result.returncode})")
                 return False
                 
         except subprocess.TimeoutExpired:
@@ -102,38 +136,44 @@ def start_frontend(port=3000, open_browser=False):
             os.environ['BROWSER'] = 'none'
         
         # Build npm command
-        cmd = ["npm", "start"]
+        cmd = [NPM or "npm", "start"]
         
         print(f"🎯 Starting Frontend on port {port}")
         print("📝 Command:", " ".join(cmd))
         print("🔄 Backend API should be running on http://127.0.0.1:8000")
         print("")
         
-        # Start the frontend
-        process = subprocess.Popen(cmd)
+        # A stale dev server on the port would otherwise look like ours starting up
+        if port_in_use("127.0.0.1", port):
+            print(f"❌ Port {port} is already in use (free it with: python cleanup_port.py {port})")
+            return False
         
-        # Wait a bit for server to start
-        time.sleep(5)
+        # Start the frontend
+        # Own process group so shutdown can reach the server's children too
+        process = subprocess.Popen(cmd, start_new_session=(os.name == "posix"))
         
-        # Check if server is running
-        if process.poll() is None:
-            print("✅ Frontend started successfully!")
-            print(f"🌐 Frontend available at: http://127.0.0.1:{port}")
-            print("")
-            print("📋 Make sure the backend is running:")
-            print("   python start_backend_only.py")
-            print("")
-            print("🎛️ Available pages:")
-            print("   • Login: http://127.0.0.1:3000/login")
-            print("   • Dashboard: http://127.0.0.1:3000/dashboard")
-            print("   • Employees: http://127.0.0.1:3000/employees")
-            print("   • Attendance: http://127.0.0.1:3000/attendance")
-            print("   • Cameras: http://127.0.0.1:3000/cameras")
-            print("")
-            print("🛑 Press Ctrl+C to stop the frontend")
+        # Report as soon as the dev server is listening; the first build can be slow
+        if wait_for_port(process, "127.0.0.1", port, timeout=60.0):
+            # Emit the whole banner in one write
+            print(
+                "✅ Frontend started successfully!\n"
+                f"🌐 Frontend available at: http://127.0.0.1:{port}\n"
+                "\n"
+                "📋 Make sure the backend is running:\n"
+                "   python start_backend_only.py\n"
+                "\n"
+                "🎛️ Available pages:\n"
+                "   • Login: http://127.0.0.1:3000/login\n"
+                "   • Dashboard: http://127.0.0.1:3000/dashboard\n"
+                "   • Employees: http://127.0.0.1:3000/employees\n"
+                "   • Attendance: http://127.0.0.1:3000/attendance\n"
+                "   • Cameras: http://127.0.0.1:3000/cameras\n"
+                "\n"
+                "🛑 Press Ctrl+C to stop the frontend"
+            )
             
             # Wait for the process to complete
-            process.wait()
+            wait_for_exit(process)
         else:
             print("❌ Frontend failed to start")
             return False
@@ -141,14 +181,21 @@ def start_frontend(port=3000, open_browser=False):
     except KeyboardInterrupt:
         print("\n🛑 Shutting down frontend...")
         if 'process' in locals():
-            process.terminate()
-            process.wait()
+            stop_process(process)
         print("✅ Frontend stopped")
         return True
     except Exception as e:
         print(f"❌ Error starting frontend: {e}")
         return False
 
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(description="Start Frontend Only")
+    parser.add_argument("--port", type=int, default=3000, help="Port to bind to")
+    parser.add_argument("--browser", action="store_true", help="Open browser automatically")
+    
+    return parser
+
 def main():
     print("🎯 Face Recognition System - Frontend Only")
     print("=" * 50)
@@ -170,12 +217,7 @@ def main():
     print()
     
     # Parse command line arguments
-    import argparse
-    parser = argparse.ArgumentParser(description="Start Frontend Only")
-    parser.add_argument("--port", type=int, default=3000, help="Port to bind to")
-    parser.add_argument("--browser", action="store_true", help="Open browser automatically")
-    
-    args = parser.parse_args()
+    args = build_parser().parse_args()
     
     # Start frontend
     if start_frontend(args.port, args.browser):
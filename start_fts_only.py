@@ -6,23 +6,46 @@ This script starts only the Face Tracking System without the API or frontend.
 
 import os
 import sys
-import time
+import argparse
 import signal
 import threading
 import asyncio
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from launch_helpers import deps_marker, store_deps_marker
+
+# Resolved once; every helper imports from and runs inside this directory
+BACKEND_DIR = Path(__file__).resolve().parent / "backend"
+
+# PyTorch memory optimization
+_FTS_ENV = {
+    'PYTORCH_CUDA_ALLOC_CONF': 'max_split_size_mb:128',
+    'CUDA_VISIBLE_DEVICES': '0',  # Use only first GPU
+    'OMP_NUM_THREADS': '1',
+    'MKL_NUM_THREADS': '1',
+    'NUMEXPR_NUM_THREADS': '1',
+    'PYTORCH_JIT': '0',
+}
+
+# Status line printed by the FTS monitor loop; missing counters show as 0
+_STATUS_FMT = ("📊 FTS Status - Uptime: {uptime_hours:.1f}h | "
+               "Cameras: {cam_count} | "
+               "Faces: {faces_detected} | "
+               "Attendance: {attendance_count}")
+
+def _ensure_backend_on_path():
+    """Put the backend directory on sys.path once, however many helpers ask"""
+    backend = str(BACKEND_DIR)
+    if backend not in sys.path:
+        sys.path.insert(0, backend)
+
 def setup_environment():
     """Set up environment variables for FTS"""
     print("🔧 Setting up FTS environment...")
     
-    # PyTorch memory optimization
-    os.environ['PYTORCH_CUDA_ALLOC_CONF'] = 'max_split_size_mb:128'
-    os.environ['CUDA_VISIBLE_DEVICES'] = '0'  # Use only first GPU
-    os.environ['OMP_NUM_THREADS'] = '1'
-    os.environ['MKL_NUM_THREADS'] = '1'
-    os.environ['NUMEXPR_NUM_THREADS'] = '1'
-    os.environ['PYTORCH_JIT'] = '0'
+    os.environ.update(_FTS_ENV)
     
     print("✅ FTS environment configured")
 
@@ -32,9 +55,8 @@ def start_fts_system():
     
     try:
         # Change to backend directory for imports
-        backend_path = Path(__file__).parent / "backend"
-        sys.path.insert(0, str(backend_path))
-        os.chdir(backend_path)
+        _ensure_backend_on_path()
+        os.chdir(BACKEND_DIR)
         
         # Import FTS functions
         from core.fts_system import start_tracking_service, shutdown_tracking_service, is_tracking_running, get_system_status
@@ -43,41 +65,42 @@ def start_fts_system():
         start_tracking_service()
         
         if is_tracking_running:
-            print("✅ Face Tracking System started successfully!")
-            print("")
-            print("🎯 FTS Status:")
-            print("   • Face Detection: Active")
-            print("   • Face Recognition: Active") 
-            print("   • Multi-Camera Tracking: Active")
-            print("   • Attendance Logging: Active")
-            print("")
-            print("📊 System will display statistics periodically...")
-            print("🛑 Press Ctrl+C to stop FTS")
-            print("")
+            # Emit the whole banner in one write
+            print(
+                "✅ Face Tracking System started successfully!\n"
+                "\n"
+                "🎯 FTS Status:\n"
+                "   • Face Detection: Active\n"
+                "   • Face Recognition: Active\n"
+                "   • Multi-Camera Tracking: Active\n"
+                "   • Attendance Logging: Active\n"
+                "\n"
+                "📊 System will display statistics periodically...\n"
+                "🛑 Press Ctrl+C to stop FTS\n"
+            )
+            
+            # Set by the signal handler so the monitor loop wakes immediately
+            shutdown_event = threading.Event()
             
             # Create shutdown handler
             def signal_handler(signum, frame):
+                shutdown_event.set()
                 print("\n🛑 Shutting down Face Tracking System...")
                 shutdown_tracking_service()
                 print("✅ FTS stopped gracefully")
-                sys.exit(0)
             
             signal.signal(signal.SIGINT, signal_handler)
             signal.signal(signal.SIGTERM, signal_handler)
             
             # Run status monitoring loop
             try:
-                while is_tracking_running:
-                    time.sleep(10)  # Check every 10 seconds
-                    
+                # Refresh status every 10 seconds until a shutdown is requested
+                while not shutdown_event.wait(timeout=10):
                     try:
-                        status = get_system_status()
-                        uptime_hours = status.get('uptime', 0) / 3600
+                        status = defaultdict(int, get_system_status())
+                        status['uptime_hours'] = status['uptime'] / 3600
                         
-                        print(f"📊 FTS Status - Uptime: {uptime_hours:.1f}h | "
-                              f"Cameras: {status.get('cam_count', 0)} | "
-                              f"Faces: {status.get('faces_detected', 0)} | "
-                              f"Attendance: {status.get('attendance_count', 0)}")
+                        print(_STATUS_FMT.format_map(status))
                               
                     except Exception as e:
                         print(f"⚠️ Status check error: {e}")
@@ -101,21 +124,40 @@ def start_fts_system():
     
     return True
 
+def _probe_import(package):
+    """Import a package by name; True if it imported"""
+    try:
+        __import__(package)
+        return True
+    except ImportError:
+        return False
+
 def check_requirements():
     """Check if FTS requirements are available"""
     print("🔍 Checking FTS requirements...")
     
     required_packages = ['torch', 'cv2', 'insightface', 'faiss', 'numpy']
+    
+    # Importing torch and insightface takes seconds; skip it if nothing changed
+    marker = deps_marker(required_packages)
+    if marker.exists():
+        print("✅ All FTS requirements available (cached)")
+        return True
+    
+    # Overlap the disk reads and extension loading of the heavy imports
+    with ThreadPoolExecutor(max_workers=len(required_packages)) as executor:
+        results = list(executor.map(_probe_import, required_packages))
+    
     missing_packages = []
     
-    for package in required_packages:
-        try:
-            if package == 'cv2':
-                import cv2
-            else:
-                __import__(package)
+    for package, available in zip(required_packages, results):
+        # Concurrent imports of shared dependencies can fail spuriously, so
+        # confirm any failure with a plain import before reporting it
+        if not available:
+            available = _probe_import(package)
+        if available:
             print(f"✅ {package}")
-        except ImportError:
+        else:
             print(f"❌ {package}")
             missing_packages.append(package)
     
@@ -124,6 +166,7 @@ def check_requirements():
         print("💡 Install them with: pip install " + " ".join(missing_packages))
         return False
     
+    store_deps_marker(marker, required_packages)
     print("✅ All FTS requirements available")
     return True
 
@@ -132,8 +175,7 @@ def check_cameras():
     print("🔍 Checking camera configuration...")
     
     try:
-        backend_path = Path(__file__).parent / "backend"
-        sys.path.insert(0, str(backend_path))
+        _ensure_backend_on_path()
         
         from utils.camera_config_loader import load_active_camera_configs
         
@@ -153,22 +195,16 @@ def check_cameras():
         print(f"⚠️ Could not check camera configuration: {e}")
         return True  # Continue anyway
 
-def run_camera_detection():
+async def run_camera_detection():
     """Run automatic camera detection and configuration"""
     try:
-        backend_path = Path(__file__).parent / "backend"
-        sys.path.insert(0, str(backend_path))
-        os.chdir(backend_path)
+        _ensure_backend_on_path()
+        os.chdir(BACKEND_DIR)
         
         from utils.auto_camera_detector import AutoCameraDetector
         
-        async def detect_cameras():
-            detector = AutoCameraDetector()
-            cameras = await detector.detect_all_cameras()
-            return cameras
-        
         # Run camera detection
-        cameras = asyncio.run(detect_cameras())
+        cameras = await AutoCameraDetector().detect_all_cameras()
         
         if cameras:
             print(f"✅ Detected and configured {len(cameras)} cameras:")
@@ -183,19 +219,22 @@ def run_camera_detection():
         print(f"❌ Error during camera detection: {e}")
         print("💡 Cameras can be added manually through the admin interface")
 
-def main():
-    print("🎯 Face Recognition System - Face Tracking System Only")
-    print("=" * 60)
-    
-    # Parse command line arguments first
-    import argparse
+def build_parser():
+    """Build the command line parser"""
     parser = argparse.ArgumentParser(description="Start Face Tracking System Only")
     parser.add_argument("--no-camera-check", action="store_true", 
                        help="Skip camera configuration check")
     parser.add_argument("--auto-detect-cameras", action="store_true",
                        help="Automatically detect and configure cameras before starting FTS")
     
-    args = parser.parse_args()
+    return parser
+
+def main():
+    print("🎯 Face Recognition System - Face Tracking System Only")
+    print("=" * 60)
+    
+    # Parse command line arguments first
+    args = build_parser().parse_args()
     
     # Check requirements
     if not check_requirements():
@@ -206,7 +245,7 @@ def main():
     # Auto-detect cameras if requested
     if args.auto_detect_cameras:
         print("🔍 Auto-detecting cameras...")
-        run_camera_detection()
+        asyncio.run(run_camera_detection())
         print()
     
     # Check cameras
@@ -8,26 +8,38 @@ import os
 import sys
 import subprocess
 import argparse
+import importlib.util
 from pathlib import Path
 
+from launch_helpers import db_check_marker, db_checked_recently, touch_marker
+
 def check_requirements():
     """Check if all required packages are installed"""
-    try:
-        import fastapi
-        import uvicorn
-        import sqlalchemy
-        # import psycopg2  # PostgreSQL support
-        import passlib
-        import jose
-        print("✅ All required packages are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing required package: {e}")
+    required_packages = ['fastapi', 'uvicorn', 'sqlalchemy', 'passlib', 'jose']
+    
+    # Locate the packages without executing them; importing fastapi alone
+    # pulls in starlette and pydantic
+    missing_packages = [
+        package for package in required_packages
+        if importlib.util.find_spec(package) is None
+    ]
+    
+    if missing_packages:
+        print(f"❌ Missing required package: {', '.join(missing_packages)}")
         print("Please install requirements with: pip install -r requirements.txt")
         return False
+    
+    print("✅ All required packages are installed")
+    return True
 
 def check_database_connection():
     """Check if database connection is working"""
+    # Skip importing the app and connecting again if a probe just succeeded
+    marker = db_check_marker()
+    if db_checked_recently(marker):
+        print("✅ Database connection successful (checked recently)")
+        return True
+    
     try:
         # Add backend to path
         backend_path = Path(__file__).parent / "backend"
@@ -41,6 +53,8 @@ def check_database_connection():
         with engine.connect() as conn:
             conn.execute(text("SELECT 1"))
         
+        touch_marker(marker)
+        
         print("✅ Database connection successful")
         return True
     except Exception as e:
@@ -98,7 +112,12 @@ def start_server(host="0.0.0.0", port=8000, reload=False, workers=1):
         print(f"📚 API Documentation: http://{host}:{port}/docs")
         print("Press Ctrl+C to stop the server")
         
-        # Start server
+        # Start server; on POSIX uvicorn replaces this process since there is
+        # nothing left to do here, which saves an idle parent interpreter
+        if os.name == "posix":
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.execv(sys.executable, cmd)
         subprocess.run(cmd)
         
     except KeyboardInterrupt:
@@ -106,8 +125,8 @@ def start_server(host="0.0.0.0", port=8000, reload=False, workers=1):
     except Exception as e:
         print(f"❌ Error starting server: {e}")
 
-def main():
-    """Main function with command line argument parsing"""
+def build_parser():
+    """Build the command line parser"""
     parser = argparse.ArgumentParser(
         description="Face Recognition Attendance System Startup Script"
     )
@@ -150,7 +169,11 @@ def main():
         help="Initialize database and exit"
     )
     
-    args = parser.parse_args()
+    return parser
+
+def main():
+    """Main function with command line argument parsing"""
+    args = build_parser().parse_args()
     
     print("🎯 Face Recognition Attendance System")
     print("=" * 50)
@@ -6,48 +6,62 @@ This script applies memory optimizations and port fixes before starting the syst
 
 import os
 import sys
+import asyncio
 import subprocess
-import time
 from pathlib import Path
 
-def setup_environment():
-    """Set up environment variables for optimal performance"""
-    print("🔧 Setting up optimized environment...")
-    
+from launch_helpers import deps_marker, port_in_use, store_deps_marker, stop_process, wait_for_exit, wait_for_port
+
+_SERVER_ENV = {
     # PyTorch memory optimization
-    os.environ['PYTORCH_CUDA_ALLOC_CONF'] = 'max_split_size_mb:128'
-    os.environ['CUDA_VISIBLE_DEVICES'] = '0'  # Use only first GPU
-    os.environ['OMP_NUM_THREADS'] = '1'
-    os.environ['MKL_NUM_THREADS'] = '1'
-    os.environ['NUMEXPR_NUM_THREADS'] = '1'
-    os.environ['PYTORCH_JIT'] = '0'
+    'PYTORCH_CUDA_ALLOC_CONF': 'max_split_size_mb:128',
+    'CUDA_VISIBLE_DEVICES': '0',  # Use only first GPU
+    'OMP_NUM_THREADS': '1',
+    'MKL_NUM_THREADS': '1',
+    'NUMEXPR_NUM_THREADS': '1',
+    'PYTORCH_JIT': '0',
     
     # Multiprocessing settings
-    os.environ['PYTORCH_MULTIPROCESSING_START_METHOD'] = 'spawn'
+    'PYTORCH_MULTIPROCESSING_START_METHOD': 'spawn',
     
     # Disable FTS auto-start initially to prevent memory conflicts
-    os.environ['FTS_AUTO_START'] = 'false'
+    'FTS_AUTO_START': 'false',
+}
+
+def setup_environment():
+    """Set up environment variables for optimal performance"""
+    print("🔧 Setting up optimized environment...")
+    
+    os.environ.update(_SERVER_ENV)
     
     print("✅ Environment configured for optimal memory usage")
 
-def run_memory_fix():
+async def run_memory_fix():
     """Run the memory and port fix script"""
     print("🔧 Running memory and port fixes...")
     
     try:
-        result = subprocess.run([sys.executable, "fix_memory_and_ports.py"], 
-                              capture_output=True, text=True, timeout=30)
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "fix_memory_and_ports.py",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
         
-        if result.returncode == 0:
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            print("⚠️ Fix script timeout, continuing...")
+            return True
+        
+        if process.returncode == 0:
             print("✅ Memory and port fixes applied successfully")
             return True
         else:
-            print(f"⚠️ Fix script warning: {result.stderr}")
+            print(f"⚠️ Fix script warning: {stderr.decode(errors='replace')}")
             return True  # Continue anyway
             
-    except subprocess.TimeoutExpired:
-        print("⚠️ Fix script timeout, continuing...")
-        return True
     except Exception as e:
         print(f"⚠️ Error running fix script: {e}")
         return True  # Continue anyway
@@ -69,27 +83,33 @@ def start_server():
         print("🎯 Starting server with conservative settings...")
         print("📝 Command:", " ".join(cmd))
         
-        # Start the server
-        process = subprocess.Popen(cmd)
+        # A stale server on the port would otherwise look like ours starting up
+        if port_in_use("127.0.0.1", 8000):
+            print("❌ Port 8000 is already in use (free it with: python cleanup_port.py 8000)")
+            return False
         
-        # Wait a bit for server to start
-        time.sleep(5)
+        # Start the server
+        # Own process group so shutdown can reach the server's children too
+        process = subprocess.Popen(cmd, start_new_session=(os.name == "posix"))
         
-        # Check if server is running
-        if process.poll() is None:
-            print("✅ Server started successfully!")
-            print("🌐 Server available at: http://127.0.0.1:8000")
-            print("📚 API docs available at: http://127.0.0.1:8000/docs")
-            print("")
-            print("💡 To enable Face Tracking System:")
-            print("   1. Go to the API docs")
-            print("   2. Use the /system/start-fts endpoint")
-            print("   3. Or set FTS_AUTO_START=true and restart")
-            print("")
-            print("🛑 Press Ctrl+C to stop the server")
+        # Report as soon as the server is listening, or as soon as it dies
+        if wait_for_port(process, "127.0.0.1", 8000):
+            # Emit the whole banner in one write
+            print(
+                "✅ Server started successfully!\n"
+                "🌐 Server available at: http://127.0.0.1:8000\n"
+                "📚 API docs available at: http://127.0.0.1:8000/docs\n"
+                "\n"
+                "💡 To enable Face Tracking System:\n"
+                "   1. Go to the API docs\n"
+                "   2. Use the /system/start-fts endpoint\n"
+                "   3. Or set FTS_AUTO_START=true and restart\n"
+                "\n"
+                "🛑 Press Ctrl+C to stop the server"
+            )
             
             # Wait for the process to complete
-            process.wait()
+            wait_for_exit(process)
         else:
             print("❌ Server failed to start")
             return False
@@ -97,8 +117,7 @@ def start_server():
     except KeyboardInterrupt:
         print("\n🛑 Shutting down server...")
         if 'process' in locals():
-            process.terminate()
-            process.wait()
+            stop_process(process)
         print("✅ Server stopped")
         return True
     except Exception as e:
@@ -110,6 +129,13 @@ def check_dependencies():
     print("🔍 Checking dependencies...")
     
     required_packages = ['torch', 'fastapi', 'uvicorn', 'psutil']
+    
+    # Importing torch takes seconds; skip it if the environment is unchanged
+    marker = deps_marker(required_packages)
+    if marker.exists():
+        print("✅ All dependencies available (cached)")
+        return True
+    
     missing_packages = []
     
     for package in required_packages:
@@ -125,25 +151,30 @@ def check_dependencies():
         print("💡 Install them with: pip install " + " ".join(missing_packages))
         return False
     
+    store_deps_marker(marker, required_packages)
     print("✅ All dependencies available")
     return True
 
+async def prepare_system():
+    """Run the import-heavy dependency check alongside the memory/port fix script"""
+    dependencies_ok, _ = await asyncio.gather(
+        asyncio.to_thread(check_dependencies),
+        run_memory_fix()
+    )
+    return dependencies_ok
+
 def main():
     print("🎯 Face Tracking System - Fixed Startup")
     print("=" * 50)
     
-    # Check dependencies
-    if not check_dependencies():
-        sys.exit(1)
-    
-    print()
-    
     # Set up environment
     setup_environment()
     print()
     
-    # Run memory fixes
-    run_memory_fix()
+    # Check dependencies and run memory fixes concurrently
+    if not asyncio.run(prepare_system()):
+        sys.exit(1)
+    
     print()
     
     # Start server
@@ -11,77 +11,146 @@ import argparse
 import socket
 import time
 import asyncio
+import importlib.util
+import psutil
 from pathlib import Path
 
+from launch_helpers import (
+    DB_CHECK_RELOAD_TTL, DB_CHECK_TTL, db_check_marker, db_checked_recently,
+    select_server_impl, touch_marker
+)
+
+# Resolved once; the database, server and camera helpers all work from here
+BACKEND_DIR = Path(__file__).resolve().parent / "backend"
+
+# Memory optimization settings applied before the app (and torch) is imported
+_FTS_ENV = {
+    'PYTORCH_CUDA_ALLOC_CONF': 'max_split_size_mb:128',
+    'OMP_NUM_THREADS': '1',
+    'MKL_NUM_THREADS': '1',
+    'NUMEXPR_NUM_THREADS': '1',
+    'PYTORCH_JIT': '0',
+}
+
+def _ensure_backend_on_path():
+    """Put the backend directory on sys.path once, however many helpers ask
+
+    Backend modules must be imported by the same names the app uses
+    (db.db_config, not backend.db.db_config); otherwise the in-process
+    server ends up with a second copy of each module, engine and pool.
+    """
+    backend = str(BACKEND_DIR)
+    if backend not in sys.path:
+        sys.path.insert(0, backend)
+
 def check_port_available(host, port):
     """Check if a port is available"""
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM | getattr(socket, "SOCK_CLOEXEC", 0))
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind((host, port))
-            return True
+        # Same bind semantics as find_available_port and uvicorn itself
+        if os.name != "nt":
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        s.bind((host, port))
+        return True
     except OSError:
         return False
+    finally:
+        s.close()
 
 def find_available_port(host, start_port, max_attempts=10):
     """Find an available port starting from start_port"""
-    for port in range(start_port, start_port + max_attempts):
-        if check_port_available(host, port):
-            return port
-    return None
+    # Wildcard addresses cannot be connected to on every platform
+    probe_host = "127.0.0.1" if host in ("", "0.0.0.0") else host
+    sock = None
+    try:
+        for port in range(start_port, start_port + max_attempts):
+            # A failed bind leaves the socket unbound, so one socket serves every attempt
+            if sock is None:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                # Match uvicorn, which can bind over TIME_WAIT; on Windows this
+                # option would allow stealing a live port, so leave it off there
+                if os.name != "nt":
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                sock.bind((host, port))
+            except OSError:
+                continue
+            
+            # Bindable is not enough: make sure nothing already answers on the port
+            sock.close()
+            sock = None
+            try:
+                with socket.create_connection((probe_host, port), timeout=0.05):
+                    pass
+            except OSError:
+                return port
+        return None
+    finally:
+        if sock is not None:
+            sock.close()
 
-def kill_process_on_port(port):
+def kill_process_on_port(port, host="0.0.0.0", release_timeout=2.0):
     """Kill any process using the specified port"""
     try:
-        # Try to find and kill process using the port
-        if sys.platform == "win32":
-            # Windows command
-            cmd = f"netstat -ano | findstr :{port}"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            if result.stdout:
-                lines = result.stdout.strip().split('\n')
-                for line in lines:
-                    if f":{port}" in line and "LISTENING" in line:
-                        parts = line.split()
-                        if len(parts) >= 5:
-                            pid = parts[-1]
-                            subprocess.run(f"taskkill /f /pid {pid}", shell=True, capture_output=True)
-                            print(f"🔄 Killed process {pid} using port {port}")
-                            time.sleep(1)  # Give time for port to be released
-        else:
-            # Unix/Linux command
-            cmd = f"lsof -ti:{port}"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            if result.stdout:
-                pids = result.stdout.strip().split('\n')
-                for pid in pids:
-                    if pid:
-                        subprocess.run(f"kill -9 {pid}", shell=True, capture_output=True)
-                        print(f"🔄 Killed process {pid} using port {port}")
-                time.sleep(1)  # Give time for port to be released
+        # Query the socket table directly instead of shelling out to netstat/lsof
+        pids = {
+            conn.pid
+            for conn in psutil.net_connections(kind='tcp')
+            if conn.pid and conn.laddr and conn.laddr.port == port
+            and conn.status == psutil.CONN_LISTEN
+        }
+        
+        killed = False
+        for pid in pids:
+            try:
+                psutil.Process(pid).kill()
+                print(f"🔄 Killed process {pid} using port {port}")
+                killed = True
+            except psutil.NoSuchProcess:
+                pass
+        
+        # Wait only as long as the OS needs to release the port; that is
+        # usually a few milliseconds, so start polling fast and back off
+        if killed:
+            deadline = time.monotonic() + release_timeout
+            delay = 0.001
+            while not check_port_available(host, port) and time.monotonic() < deadline:
+                time.sleep(delay)
+                delay = min(delay * 2, 0.032)
     except Exception as e:
         print(f"⚠️ Could not kill process on port {port}: {e}")
 
 def check_requirements():
     """Check if all required packages are installed"""
-    try:
-        import fastapi
-        import uvicorn
-        import sqlalchemy
-        # import psycopg2  # PostgreSQL support
-        import passlib
-        import jose
-        print("✅ All required packages are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing required package: {e}")
+    required_packages = ['fastapi', 'uvicorn', 'sqlalchemy', 'passlib', 'jose']
+    
+    # Locate the packages without executing them; importing fastapi alone
+    # pulls in starlette and pydantic
+    missing_packages = [
+        package for package in required_packages
+        if importlib.util.find_spec(package) is None
+    ]
+    
+    if missing_packages:
+        print(f"❌ Missing required package: {', '.join(missing_packages)}")
         print("Please install requirements with: pip install -r requirements.txt")
         return False
+    
+    print("✅ All required packages are installed")
+    return True
 
-def check_database_connection():
+def check_database_connection(ttl=DB_CHECK_TTL):
     """Test database connection"""
+    marker = db_check_marker()
+    if db_checked_recently(marker, ttl):
+        print("✅ Database connection successful (checked recently)")
+        return True
+    
     try:
-        from backend.db.db_config import test_connection
+        _ensure_backend_on_path()
+        from db.db_config import test_connection
         if test_connection():
+            touch_marker(marker)
             print("✅ Database connection successful")
             return True
         else:
@@ -94,13 +163,12 @@ def check_database_connection():
 def initialize_database():
     """Initialize database with tables and sample data"""
     try:
-        backend_path = Path(__file__).parent / "backend"
-        init_script = backend_path / "init_db.py"
+        init_script = BACKEND_DIR / "init_db.py"
         
         if init_script.exists():
             print("🔄 Initializing database...")
             result = subprocess.run([sys.executable, str(init_script)], 
-                                  cwd=str(backend_path), 
+                                  cwd=str(BACKEND_DIR), 
                                   capture_output=True, 
                                   text=True)
             
@@ -122,12 +190,8 @@ def start_server(host="0.0.0.0", port=8000, reload=False, workers=1, enable_fts=
     try:
         print("🔧 Optimizing system for Face Tracking System...")
         
-        # Set environment variables for memory optimization BEFORE any imports
-        os.environ['PYTORCH_CUDA_ALLOC_CONF'] = 'max_split_size_mb:128'
-        os.environ['OMP_NUM_THREADS'] = '1'
-        os.environ['MKL_NUM_THREADS'] = '1'
-        os.environ['NUMEXPR_NUM_THREADS'] = '1'
-        os.environ['PYTORCH_JIT'] = '0'
+        # Normally applied by main() already; repeated for direct callers
+        os.environ.update(_FTS_ENV)
         
         # Force single worker mode if FTS is enabled to prevent memory conflicts
         if enable_fts and workers > 1:
@@ -141,7 +205,7 @@ def start_server(host="0.0.0.0", port=8000, reload=False, workers=1, enable_fts=
             else:
                 print(f"⚠️ Port {port} is already in use")
                 print(f"🔄 Attempting to free port {port}...")
-            kill_process_on_port(port)
+            kill_process_on_port(port, host)
             
             # Check again if port is now available
             if check_port_available(host, port):
@@ -156,8 +220,8 @@ def start_server(host="0.0.0.0", port=8000, reload=False, workers=1, enable_fts=
                     print(f"❌ No available ports found starting from {port}")
                     return
         
-        backend_path = Path(__file__).parent / "backend"
-        os.chdir(backend_path)
+        os.chdir(BACKEND_DIR)
+        _ensure_backend_on_path()
         
         # Set environment variable for FTS auto-start
         if enable_fts:
@@ -167,55 +231,56 @@ def start_server(host="0.0.0.0", port=8000, reload=False, workers=1, enable_fts=
             os.environ["FTS_AUTO_START"] = "false"
             print("⚠️ Face Tracking System auto-start is disabled")
         
-        # Build uvicorn command with conservative settings
-        cmd = [
-            sys.executable, "-m", "uvicorn",
-            "app.main:app",
-            "--host", host,
-            "--port", str(port),
-            "--access-log",  # Enable access logging
-            "--loop", "asyncio",  # Use asyncio loop for better compatibility
-        ]
-        
-        if reload:
-            cmd.append("--reload")
+        # Run uvicorn in this interpreter instead of spawning a second one
+        import uvicorn
         
         # Only use multiple workers if reload is disabled and FTS is disabled
-        if workers > 1 and not reload and not enable_fts:
-            cmd.extend(["--workers", str(workers)])
+        use_workers = workers > 1 and not reload and not enable_fts
         
-        print("🎯 Face Recognition Attendance System")
-        print("=" * 50)
-        print(f"🚀 Starting unified server on http://{host}:{port}")
-        print(f"📚 API Documentation: http://{host}:{port}/docs")
-        print(f"🤖 FTS Integration: {'Enabled' if enable_fts else 'Disabled'}")
-        print("Press Ctrl+C to stop the server")
-        print("=" * 50)
+        # Prefer uvloop/httptools, falling back to asyncio/h11 (e.g. on Windows)
+        loop, http = select_server_impl()
         
-        # Start server
-        subprocess.run(cmd)
+        # Emit the whole banner in one write
+        rule = "=" * 50
+        print(
+            "🎯 Face Recognition Attendance System\n"
+            f"{rule}\n"
+            f"🚀 Starting unified server on http://{host}:{port}\n"
+            f"📚 API Documentation: http://{host}:{port}/docs\n"
+            f"🤖 FTS Integration: {'Enabled' if enable_fts else 'Disabled'}\n"
+            "Press Ctrl+C to stop the server\n"
+            f"{rule}",
+            flush=True
+        )
+        
+        # Start server with conservative settings; blocks until it shuts down
+        uvicorn.run(
+            "app.main:app",
+            host=host,
+            port=port,
+            reload=reload,
+            workers=workers if use_workers else None,
+            access_log=True,  # Enable access logging
+            loop=loop,
+            http=http
+        )
         
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
     except Exception as e:
         print(f"❌ Error starting server: {e}")
 
-def run_camera_detection():
+async def run_camera_detection():
     """Run automatic camera detection and configuration"""
     try:
         print("🔍 Starting automatic camera detection...")
         
         # Import here to avoid circular imports
-        sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-        from backend.utils.auto_camera_detector import AutoCameraDetector
-        
-        async def detect_cameras():
-            detector = AutoCameraDetector()
-            cameras = await detector.detect_all_cameras()
-            return cameras
+        _ensure_backend_on_path()
+        from utils.auto_camera_detector import AutoCameraDetector
         
         # Run camera detection
-        cameras = asyncio.run(detect_cameras())
+        cameras = await AutoCameraDetector().detect_all_cameras()
         
         if cameras:
             print(f"✅ Detected and configured {len(cameras)} cameras:")
@@ -233,8 +298,8 @@ def run_camera_detection():
         print("💡 Cameras can be added manually through the admin interface")
         print()  # Add spacing
 
-def main():
-    """Main function with command line argument parsing"""
+def build_parser():
+    """Build the command line parser"""
     parser = argparse.ArgumentParser(
         description="Face Recognition Attendance System Unified Startup Script"
     )
@@ -262,7 +327,7 @@ def main():
         "--workers", 
         type=int, 
         default=1, 
-        help="Number of worker processes (default: 1)"
+        help="Number of worker processes; 0 picks 2*CPUs+1 when reload and FTS are off (default: 1)"
     )
     
     parser.add_argument(
@@ -301,7 +366,18 @@ def main():
         help="Automatically detect and configure cameras on startup"
     )
     
-    args = parser.parse_args()
+    return parser
+
+# Built once at import; main() and callers that respawn the launcher only parse
+_PARSER = build_parser()
+
+def main():
+    """Main function with command line argument parsing"""
+    args = _PARSER.parse_args()
+    
+    # The server runs in this process, so thread limits must be set before
+    # the checks and camera detection import numpy, cv2 or torch
+    os.environ.update(_FTS_ENV)
     
     print("🎯 Face Recognition Attendance System - Unified Server")
     print("=" * 60)
@@ -324,14 +400,16 @@ def main():
         if not check_requirements():
             sys.exit(1)
         
-        if not check_database_connection():
+        # Development restarts come often; trust a recent probe for longer
+        ttl = DB_CHECK_RELOAD_TTL if args.reload else DB_CHECK_TTL
+        if not check_database_connection(ttl):
             print("\n💡 Tip: Try running with --init-db to initialize the database")
             sys.exit(1)
     
     # Auto-detect cameras if requested
     if args.auto_detect_cameras:
         print("🔍 Auto-detecting cameras...")
-        run_camera_detection()
+        asyncio.run(run_camera_detection())
     
     # Determine FTS enable status
     # Priority: --enable-fts > --no-fts > default (disabled for stability)
@@ -345,6 +423,14 @@ def main():
         enable_fts = False  # Default to disabled for stability
         print("⚠️ Face Tracking System disabled by default (use --enable-fts to enable)")
     
+    # --workers 0 means size the pool to the machine; FTS and reload need a single process
+    if args.workers == 0:
+        if not args.reload and not enable_fts:
+            args.workers = 2 * (os.cpu_count() or 1) + 1
+            print(f"⚙️ Auto-selected {args.workers} worker processes")
+        else:
+            args.workers = 1
+    
     # Start unified server
     start_server(
         host=args.host,
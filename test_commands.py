@@ -4,14 +4,29 @@ Test Command Line Arguments
 This script tests that all startup commands work correctly.
 """
 
+import importlib
 import subprocess
 import sys
+from pathlib import Path
+
+def load_parser(script):
+    """Import a startup script and return its argparse parser, or None if it has none"""
+    module = importlib.import_module(Path(script).stem)
+    build_parser = getattr(module, "build_parser", None)
+    return build_parser() if build_parser else None
 
 def test_command_help(command, description):
     """Test that a command's help works"""
     print(f"🔍 Testing {description}...")
     
     try:
+        # Render the help in-process instead of starting an interpreter per script
+        parser = load_parser(command[0])
+        if parser is not None:
+            parser.format_help()
+            print(f"✅ {description} help works")
+            return True
+        
         result = subprocess.run(
             [sys.executable] + command + ["--help"], 
             capture_output=True, 
@@ -39,14 +54,9 @@ def test_unified_server_args():
     
     # Test that --enable-fts is now accepted
     try:
-        result = subprocess.run(
-            [sys.executable, "start_unified_server.py", "--enable-fts", "--help"], 
-            capture_output=True, 
-            text=True,
-            timeout=10
-        )
+        parser = load_parser("start_unified_server.py")
         
-        if result.returncode == 0 and "--enable-fts" in result.stdout:
+        if parser.parse_args(["--enable-fts"]).enable_fts and "--enable-fts" in parser.format_help():
             print("✅ --enable-fts argument is available")
             return True
         else:
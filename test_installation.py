@@ -8,6 +8,7 @@ import os
 import requests
 import time
 import subprocess
+import functools
 from pathlib import Path
 
 def test_imports():
@@ -94,23 +95,32 @@ def test_database_models():
         print(f"❌ Database models error: {e}")
         return False
 
-def test_api_server():
-    """Test if the API server can start and respond"""
+def start_api_server():
+    """Start the API server in the background for test_api_server"""
+    backend_path = Path(__file__).parent / "backend"
+    return subprocess.Popen([
+        sys.executable, "-m", "uvicorn",
+        "app.main:app",
+        "--host", "127.0.0.1",
+        "--port", "8001"
+    ], cwd=str(backend_path), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def test_api_server(server_process=None, started_at=None):
+    """Test if the API server can start and respond
+
+    main() starts the server early and passes it in, so the startup wait
+    overlaps the other tests; time already spent counts towards the wait.
+    """
     print("🔍 Testing API server startup...")
     
     try:
-        backend_path = Path(__file__).parent / "backend"
-        
         # Start server in background
-        server_process = subprocess.Popen([
-            sys.executable, "-m", "uvicorn",
-            "app.main:app",
-            "--host", "127.0.0.1",
-            "--port", "8001"
-        ], cwd=str(backend_path), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if server_process is None:
+            server_process = start_api_server()
+            started_at = time.monotonic()
         
         # Wait for server to start
-        time.sleep(3)
+        time.sleep(max(0.0, 3 - (time.monotonic() - started_at)))
         
         # Test health endpoint
         try:
@@ -159,31 +169,46 @@ def test_configuration():
         print(f"❌ Configuration error: {e}")
         return False
 
+def run_test(test_name, test_func):
+    """Run one test, reporting failures; True if it passed"""
+    print(f"\n📋 Running {test_name} test...")
+    try:
+        if test_func():
+            return True
+        print(f"❌ {test_name} test failed")
+    except Exception as e:
+        print(f"❌ {test_name} test error: {e}")
+    return False
+
 def main():
     """Run all tests"""
     print("🧪 Face Recognition Attendance System - Installation Test")
     print("=" * 60)
     
+    # Start the API server first so its startup wait overlaps the in-process
+    # tests; a failure to launch is reported by the API server test itself
+    try:
+        server_process = start_api_server()
+    except Exception:
+        server_process = None
+    started_at = time.monotonic()
+    
     tests = [
         ("Imports", test_imports),
         ("Password Hashing", test_password_hashing),
         ("Database Models", test_database_models),
         ("Configuration", test_configuration),
-        ("API Server", test_api_server),
+        ("API Server", functools.partial(test_api_server, server_process, started_at)),
     ]
     
-    passed = 0
-    total = len(tests)
+    # Every test imports from the backend, not just the first one to run
+    backend_path = str(Path(__file__).parent / "backend")
+    if backend_path not in sys.path:
+        sys.path.insert(0, backend_path)
     
-    for test_name, test_func in tests:
-        print(f"\n📋 Running {test_name} test...")
-        try:
-            if test_func():
-                passed += 1
-            else:
-                print(f"❌ {test_name} test failed")
-        except Exception as e:
-            print(f"❌ {test_name} test error: {e}")
+    results = [run_test(test_name, test_func) for test_name, test_func in tests]
+    passed = sum(results)
+    total = len(results)
     
     print("\n" + "=" * 60)
     print(f"🎯 Test Results: {passed}/{total} tests passed")
@@ -4,35 +4,260 @@ Comprehensive Integration Verification Script
 Tests frontend-backend integration and system functionality
 """
 
+import io
+import re
+import atexit
+import ast
 import sys
 import os
 import subprocess
 import json
-from pathlib import Path
+import mmap
+import functools
+import importlib.util
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+from verify_imports import existing_files
+
+# Emoji that must no longer appear in fix_memory_and_ports.py
+_EMOJI_BANLIST = re.compile("📊|🔧".encode())
+
+# Every raise in cameras.py; group 1 is set when it carries the old 17-space indent
+_HTTP_RAISE = re.compile(rb"( {17})?raise HTTPException\(")
+
+# Only a bytes build of pyahocorasick can scan file contents without decoding
+# them; the default (unicode) PyPI build falls back to mmap.find per needle
+_BYTES_AUTOMATON = ahocorasick is not None and not ahocorasick.unicode
+
+@functools.lru_cache(maxsize=None)
+def _needle_automaton(needles):
+    """Aho-Corasick automaton matching every needle's UTF-8 bytes in one pass"""
+    automaton = ahocorasick.Automaton()
+    for needle in needles:
+        automaton.add_word(needle.encode(), needle)
+    automaton.make_automaton()
+    return automaton
+
+class ThreadBufferedStdout:
+    """sys.stdout stand-in that can divert each thread's prints to its own buffer"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        return getattr(self._local, "buffer", self._stream).write(text)
+    
+    def flush(self):
+        getattr(self._local, "buffer", self._stream).flush()
+    
+    def capture(self):
+        self._local.buffer = io.StringIO()
+    
+    def release(self):
+        output = self._local.buffer.getvalue()
+        del self._local.buffer
+        return output
+
+def run_check(stdout, test_name, test_func):
+    """Run one check with its output buffered; returns (result, output)"""
+    stdout.capture()
+    try:
+        result = test_func()
+    except Exception as e:
+        print(f"❌ {test_name} failed with exception: {e}")
+        result = False
+    finally:
+        output = stdout.release()
+    return result, output
+
+# Mappings shared by every check that opens the same file; closed at exit
+_MAPPED_FILES = {}
+
+def mapped_file(path):
+    """Read-only mapping of the file at `path`, shared by every check that opens it
+
+    Raises FileNotFoundError if the file does not exist.
+    """
+    mm = _MAPPED_FILES.get(path)
+    if mm is not None:
+        return mm
+    
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            mm = b""  # an empty file cannot be mapped
+        else:
+            # The mapping keeps its own reference to the file after f is closed
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    # Two checks may map the same file at once; keep one and close the other
+    shared = _MAPPED_FILES.setdefault(path, mm)
+    if shared is not mm and isinstance(mm, mmap.mmap):
+        mm.close()
+    return shared
+
+@atexit.register
+def _close_mapped_files():
+    """Release the shared mappings when verification ends"""
+    for mm in _MAPPED_FILES.values():
+        if isinstance(mm, mmap.mmap):
+            mm.close()
+    _MAPPED_FILES.clear()
+
+def find_in_file(path, needles):
+    """Return the subset of `needles` found in the file at `path`
+
+    The file is memory-mapped and searched as bytes, so it is never decoded.
+    With a bytes build of pyahocorasick, all needles are matched in a single
+    scan. Raises FileNotFoundError if the file does not exist.
+    """
+    mm = mapped_file(path)
+    if _BYTES_AUTOMATON:
+        # The automaton takes a bytes object, not a buffer, hence the copy
+        automaton = _needle_automaton(tuple(needles))
+        return {needle for _, needle in automaton.iter(bytes(mm))}
+    return {needle for needle in needles if mm.find(needle.encode()) != -1}
+
+def _frontend_deps_installed():
+    """True if the last npm install in frontend/ ran to completion
+
+    npm writes node_modules/.package-lock.json only once an install finishes,
+    so a tree left by a killed or timed-out install does not count.
+    """
+    try:
+        installed = os.path.getmtime("frontend/node_modules/.package-lock.json")
+    except OSError:
+        return False
+    if not os.path.exists("frontend/node_modules/.bin/react-scripts"):
+        return False
+    try:
+        return installed >= os.path.getmtime("frontend/package-lock.json")
+    except OSError:
+        return True  # no lockfile to be stale against
 
 def check_frontend_build():
     """Test frontend build process"""
     print("🔧 Testing Frontend Build...")
     try:
-        result = subprocess.run(
+        # A fresh checkout has nothing to build with; install from the lockfile,
+        # preferring the npm cache. A complete, up-to-date node_modules is left
+        # alone, and react-scripts keeps its webpack cache in node_modules/.cache
+        if not _frontend_deps_installed():
+            install_cmd = ["npm", "ci", "--prefer-offline", "--no-audit", "--no-fund"]
+            if not os.access("frontend/package-lock.json", os.F_OK):
+                install_cmd[1] = "install"
+            install = subprocess.run(
+                install_cmd,
+                cwd="frontend",
+                capture_output=True,
+                text=True,
+                timeout=300
+            )
+            if install.returncode != 0:
+                print("❌ Frontend dependency installation failed:")
+                print(install.stderr)
+                return False
+        
+        process = subprocess.Popen(
             ["npm", "run", "build"],
             cwd="frontend",
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=120
+            bufsize=1
         )
         
-        if result.returncode == 0:
+        # Reading below blocks on the pipe, so enforce the timeout from a timer
+        timed_out = threading.Event()
+        def kill_build():
+            timed_out.set()
+            process.kill()
+        timer = threading.Timer(120, kill_build)
+        timer.start()
+        
+        # Stream the log and keep only its tail, which is where build errors end up
+        tail = deque(maxlen=40)
+        try:
+            with process:
+                for line in process.stdout:
+                    tail.append(line)
+        finally:
+            timer.cancel()
+        
+        if timed_out.is_set():
+            print("❌ Frontend build test failed: timed out after 120 seconds")
+            return False
+        
+        if process.returncode == 0:
             print("✅ Frontend builds successfully")
             return True
         else:
             print("❌ Frontend build failed:")
-            print(result.stderr)
+            print("".join(tail))
             return False
     except Exception as e:
         print(f"❌ Frontend build test failed: {e}")
         return False
 
+def bytecode_is_current(path):
+    """True if the cached .pyc for `path` was compiled from its current contents
+
+    A .pyc only exists for source that compiled, so a current one proves the
+    syntax without parsing the file again. The cache location follows
+    sys.pycache_prefix (PYTHONPYCACHEPREFIX) like the interpreter's own.
+    """
+    try:
+        source = os.stat(path)
+        with open(importlib.util.cache_from_source(path), "rb") as f:
+            header = f.read(16)
+    except OSError:
+        return False
+    
+    # Timestamp-based header: magic, flags == 0, source mtime, source size
+    return (
+        len(header) == 16
+        and header[:4] == importlib.util.MAGIC_NUMBER
+        and int.from_bytes(header[4:8], "little") == 0
+        and int.from_bytes(header[8:12], "little") == int(source.st_mtime) & 0xFFFFFFFF
+        and int.from_bytes(header[12:16], "little") == source.st_size & 0xFFFFFFFF
+    )
+
+@functools.lru_cache(maxsize=None)
+def parsed_source(path):
+    """AST of the file at `path`, parsed once for every check that needs it"""
+    return ast.parse(mapped_file(path)[:], filename=path)
+
+def column_names(tree, class_name):
+    """Names assigned a Column(...) directly in the body of class `class_name`"""
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            return {
+                target.id
+                for statement in node.body
+                if isinstance(statement, ast.Assign)
+                and isinstance(statement.value, ast.Call)
+                and isinstance(statement.value.func, ast.Name)
+                and statement.value.func.id == "Column"
+                for target in statement.targets
+                if isinstance(target, ast.Name)
+            }
+    return None
+
+def syntax_error(path):
+    """Parse the file at `path`; returns None if it parses, else an error message"""
+    try:
+        parsed_source(path)
+    except SyntaxError as e:
+        return f"{e.filename}:{e.lineno}: {e.msg}"
+    return None
+
 def check_python_syntax():
     """Check Python syntax for key backend files"""
     print("\n🐍 Testing Python Syntax...")
@@ -49,16 +274,13 @@ def check_python_syntax():
     all_passed = True
     for file_path in files_to_check:
         try:
-            result = subprocess.run(
-                ["python3", "-m", "py_compile", file_path],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
+            # Parse in this interpreter rather than starting one per file,
+            # and only when the cached bytecode is missing or stale
+            error = None if bytecode_is_current(file_path) else syntax_error(file_path)
+            if error is None:
                 print(f"✅ {file_path}")
             else:
-                print(f"❌ {file_path}: {result.stderr}")
+                print(f"❌ {file_path}: {error}")
                 all_passed = False
         except Exception as e:
             print(f"❌ {file_path}: {e}")
@@ -71,12 +293,6 @@ def check_api_structure():
     print("\n🔗 Checking API Structure...")
     
     # Check if all expected API methods exist in the frontend
-    api_file = Path("frontend/src/services/api.ts")
-    if not api_file.exists():
-        print("❌ API service file not found")
-        return False
-    
-    content = api_file.read_text()
     expected_methods = [
         "detectAllCameras",
         "configureCameraForFts", 
@@ -86,10 +302,13 @@ def check_api_structure():
         "getSupportedResolutions"
     ]
     
-    missing_methods = []
-    for method in expected_methods:
-        if method not in content:
-            missing_methods.append(method)
+    try:
+        found = find_in_file("frontend/src/services/api.ts", expected_methods)
+    except FileNotFoundError:
+        print("❌ API service file not found")
+        return False
+    
+    missing_methods = [method for method in expected_methods if method not in found]
     
     if missing_methods:
         print(f"❌ Missing API methods: {', '.join(missing_methods)}")
@@ -103,23 +322,19 @@ def check_route_configuration():
     """Check if routes are properly configured"""
     print("\n🛣️  Checking Route Configuration...")
     
-    # Check App.tsx for camera detection route
-    app_file = Path("frontend/src/App.tsx")
-    if not app_file.exists():
-        print("❌ App.tsx not found")
-        return False
-    
-    content = app_file.read_text()
-    
     required_routes = [
         "camera-detection",
         "CameraDetectionManagement"
     ]
     
-    missing_routes = []
-    for route in required_routes:
-        if route not in content:
-            missing_routes.append(route)
+    # Check App.tsx for camera detection route
+    try:
+        found = find_in_file("frontend/src/App.tsx", required_routes)
+    except FileNotFoundError:
+        print("❌ App.tsx not found")
+        return False
+    
+    missing_routes = [route for route in required_routes if route not in found]
     
     if missing_routes:
         print(f"❌ Missing routes: {', '.join(missing_routes)}")
@@ -133,24 +348,27 @@ def check_database_models():
     """Check database model consistency"""
     print("\n💾 Checking Database Models...")
     
+    required_fields = [
+        "source",   # For camera source tracking
+        "name",     # For camera name
+        "location"  # For camera location
+    ]
+    
     # Check if all required fields exist in CameraConfig model
-    models_file = Path("backend/db/db_models.py")
-    if not models_file.exists():
+    try:
+        columns = column_names(parsed_source("backend/db/db_models.py"), "CameraConfig")
+    except FileNotFoundError:
         print("❌ Database models file not found")
         return False
+    except SyntaxError as e:
+        print(f"❌ Database models file does not parse: {e.msg} (line {e.lineno})")
+        return False
     
-    content = models_file.read_text()
-    
-    required_fields = [
-        "source = Column",  # For camera source tracking
-        "name = Column",    # For camera name
-        "location = Column" # For camera location
-    ]
+    if columns is None:
+        print("❌ CameraConfig model not found")
+        return False
     
-    missing_fields = []
-    for field in required_fields:
-        if field not in content:
-            missing_fields.append(field)
+    missing_fields = [field for field in required_fields if field not in columns]
     
     if missing_fields:
         print(f"❌ Missing database fields: {', '.join(missing_fields)}")
@@ -164,25 +382,27 @@ def check_component_dependencies():
     """Check if all React components have proper dependencies"""
     print("\n⚛️  Checking React Component Dependencies...")
     
+    spinner_file = "frontend/src/components/ui/LoadingSpinner.tsx"
+    badge_file = "frontend/src/components/ui/Badge.tsx"
+    camera_page = "frontend/src/pages/super-admin/CameraDetectionManagement.tsx"
+    present_files = existing_files([spinner_file, badge_file, camera_page])
+    
     # Check if LoadingSpinner component exists
-    spinner_file = Path("frontend/src/components/ui/LoadingSpinner.tsx")
-    if not spinner_file.exists():
+    if spinner_file not in present_files:
         print("❌ LoadingSpinner component not found")
         return False
     else:
         print("✅ LoadingSpinner component exists")
     
     # Check if Badge component exists
-    badge_file = Path("frontend/src/components/ui/Badge.tsx")
-    if not badge_file.exists():
+    if badge_file not in present_files:
         print("❌ Badge component not found")
         return False
     else:
         print("✅ Badge component exists")
     
     # Check if CameraDetectionManagement page exists
-    camera_page = Path("frontend/src/pages/super-admin/CameraDetectionManagement.tsx")
-    if not camera_page.exists():
+    if camera_page not in present_files:
         print("❌ CameraDetectionManagement page not found")
         return False
     else:
@@ -194,18 +414,18 @@ def check_navigation_integration():
     """Check if navigation is properly integrated"""
     print("\n🧭 Checking Navigation Integration...")
     
-    layout_file = Path("frontend/src/components/layout/DashboardLayout.tsx")
-    if not layout_file.exists():
+    try:
+        found = find_in_file("frontend/src/components/layout/DashboardLayout.tsx",
+                             ["Camera Detection", "/super-admin/camera-detection"])
+    except FileNotFoundError:
         print("❌ DashboardLayout not found")
         return False
     
-    content = layout_file.read_text()
-    
-    if "Camera Detection" not in content:
+    if "Camera Detection" not in found:
         print("❌ Camera Detection menu item not found")
         return False
     
-    if "/super-admin/camera-detection" not in content:
+    if "/super-admin/camera-detection" not in found:
         print("❌ Camera Detection route not found in navigation")
         return False
     
@@ -216,39 +436,46 @@ def verify_error_fixes():
     """Verify that previous errors have been fixed"""
     print("\n🔧 Verifying Error Fixes...")
     
+    # (passed, message) pairs
     fixes_verified = []
     
     # Check cameras.py indentation fix
-    cameras_file = Path("backend/app/routers/cameras.py")
-    if cameras_file.exists():
-        content = cameras_file.read_text()
-        if "raise HTTPException(" in content and "                 raise HTTPException(" not in content:
-            fixes_verified.append("✅ Cameras.py indentation fixed")
+    try:
+        misindented = [
+            match.group(1) is not None
+            for match in _HTTP_RAISE.finditer(mapped_file("backend/app/routers/cameras.py"))
+        ]
+        if misindented and not any(misindented):
+            fixes_verified.append((True, "✅ Cameras.py indentation fixed"))
         else:
-            fixes_verified.append("❌ Cameras.py indentation still has issues")
+            fixes_verified.append((False, "❌ Cameras.py indentation still has issues"))
+    except FileNotFoundError:
+        pass
     
     # Check unicode emoji fixes
-    memory_file = Path("fix_memory_and_ports.py")
-    if memory_file.exists():
-        content = memory_file.read_text()
-        if "📊" not in content and "🔧" not in content:
-            fixes_verified.append("✅ Unicode emoji issues fixed")
+    try:
+        if _EMOJI_BANLIST.search(mapped_file("fix_memory_and_ports.py")) is None:
+            fixes_verified.append((True, "✅ Unicode emoji issues fixed"))
         else:
-            fixes_verified.append("❌ Unicode emoji issues still present")
+            fixes_verified.append((False, "❌ Unicode emoji issues still present"))
+    except FileNotFoundError:
+        pass
     
     # Check API service methods
-    api_file = Path("frontend/src/services/api.ts")
-    if api_file.exists():
-        content = api_file.read_text()
-        if "getSupportedResolutions" in content and "apiService.get(" not in content:
-            fixes_verified.append("✅ API service methods properly implemented")
+    try:
+        found = find_in_file("frontend/src/services/api.ts",
+                             ["getSupportedResolutions", "apiService.get("])
+        if "getSupportedResolutions" in found and "apiService.get(" not in found:
+            fixes_verified.append((True, "✅ API service methods properly implemented"))
         else:
-            fixes_verified.append("❌ API service still has method issues")
+            fixes_verified.append((False, "❌ API service still has method issues"))
+    except FileNotFoundError:
+        pass
     
-    for fix in fixes_verified:
-        print(fix)
+    for _, message in fixes_verified:
+        print(message)
     
-    return all("✅" in fix for fix in fixes_verified)
+    return all(passed for passed, _ in fixes_verified)
 
 def main():
     """Main verification function"""
@@ -268,47 +495,60 @@ def main():
     
     results = []
     
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ {test_name} failed with exception: {e}")
-            results.append((test_name, False))
-    
-    # Summary
-    print("\n📊 VERIFICATION SUMMARY")
-    print("=" * 40)
-    
-    passed = 0
-    failed = 0
+    # The checks are independent, so run them side by side; the frontend build
+    # is submitted first since everything else finishes within its runtime.
+    # Each check's output is buffered and printed in the original order.
+    real_stdout = sys.stdout
+    stdout = ThreadBufferedStdout(real_stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [
+                (test_name, executor.submit(run_check, stdout, test_name, test_func))
+                for test_name, test_func in tests
+            ]
+            for test_name, future in futures:
+                # One write and flush per check rather than one per line
+                result, output = future.result()
+                real_stdout.write(output)
+                real_stdout.flush()
+                results.append((test_name, result))
+    finally:
+        sys.stdout = real_stdout
+    
+    # Summary, collected and written in one go
+    summary = ["\n📊 VERIFICATION SUMMARY", "=" * 40]
     
     for test_name, result in results:
         status = "✅ PASS" if result else "❌ FAIL"
-        print(f"{status}: {test_name}")
-        if result:
-            passed += 1
-        else:
-            failed += 1
+        summary.append(f"{status}: {test_name}")
+    
+    passed = sum(result for _, result in results)
+    failed = len(results) - passed
     
-    print(f"\nTotal: {len(results)} tests")
-    print(f"Passed: {passed}")
-    print(f"Failed: {failed}")
+    summary.append(f"\nTotal: {len(results)} tests")
+    summary.append(f"Passed: {passed}")
+    summary.append(f"Failed: {failed}")
     
     if failed == 0:
-        print("\n🎉 ALL TESTS PASSED! System is ready for use.")
-        print("\n✅ Integration Status: SUCCESSFUL")
-        print("\n👉 Next Steps:")
-        print("   1. Start the backend: python start_unified_server.py --enable-fts")
-        print("   2. Start the frontend: cd frontend && npm start")
-        print("   3. Login as Super Admin")
-        print("   4. Navigate to Camera Detection page")
-        print("   5. Run camera detection and configure cameras")
-        return True
+        summary += [
+            "\n🎉 ALL TESTS PASSED! System is ready for use.",
+            "\n✅ Integration Status: SUCCESSFUL",
+            "\n👉 Next Steps:",
+            "   1. Start the backend: python start_unified_server.py --enable-fts",
+            "   2. Start the frontend: cd frontend && npm start",
+            "   3. Login as Super Admin",
+            "   4. Navigate to Camera Detection page",
+            "   5. Run camera detection and configure cameras",
+        ]
     else:
-        print(f"\n💥 {failed} TESTS FAILED! Please fix the issues above.")
-        print("\n❌ Integration Status: NEEDS FIXES")
-        return False
+        summary += [
+            f"\n💥 {failed} TESTS FAILED! Please fix the issues above.",
+            "\n❌ Integration Status: NEEDS FIXES",
+        ]
+    
+    print("\n".join(summary), flush=True)
+    return failed == 0
 
 if __name__ == "__main__":
     success = main()